@@ -0,0 +1 @@
+"""Support modules for the Ultron BBS chat bot."""
@@ -0,0 +1,47 @@
+"""
+Command line entry point.
+
+    python -m bbsbot --headless --host bbs.example.com --port 23
+    python -m bbsbot --headless --favorites
+
+Without --headless the Tk front end (UltronPreAlpha.py) is started instead.
+"""
+import argparse
+import logging
+
+from bbsbot.config import DEFAULT_LOG_LEVEL
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bbsbot", description="Ultron BBS chat bot")
+    parser.add_argument("--headless", action="store_true", help="run without the Tk GUI")
+    parser.add_argument("--host", default="bbs.example.com", help="BBS host name")
+    parser.add_argument("--port", type=int, default=23, help="BBS telnet port")
+    parser.add_argument("--favorites", action="store_true",
+                        help="headless: connect to every favorites.json address on one event loop")
+    parser.add_argument("--auto-login", action="store_true",
+                        help="answer the login prompts with the saved username and password")
+    parser.add_argument("--log-file", default="bbsbot.log", help="log file for headless mode")
+    parser.add_argument("--log-level", default=DEFAULT_LOG_LEVEL, help="DEBUG, INFO, WARNING, ...")
+    args = parser.parse_args()
+
+    if not args.headless:
+        # The Tk front end lives in the main script next to this package
+        from UltronPreAlpha import main as gui_main
+        gui_main()
+        return
+
+    logging.basicConfig(
+        filename=args.log_file,
+        level=args.log_level,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    from bbsbot import headless
+    if args.favorites:
+        headless.run_favorites(auto_login=args.auto_login)
+    else:
+        headless.run(args.host, args.port, auto_login=args.auto_login)
+
+
+if __name__ == "__main__":
+    main()
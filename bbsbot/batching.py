@@ -0,0 +1,31 @@
+import queue
+import time
+
+
+def drain_in_batches(items, batch_size, flush_interval, flush):
+    """
+    Take items off a queue.Queue and pass them to flush() in batches, until a None arrives.
+
+    A batch holds up to `batch_size` items and is flushed no later than
+    `flush_interval` seconds after its first item was taken. Items queued
+    before the None are still flushed. Runs on the caller's thread.
+    """
+    stopping = False
+    while not stopping:
+        item = items.get()
+        if item is None:
+            break
+        # Gather whatever else arrives within the flush interval into one batch
+        batch = [item]
+        deadline = time.monotonic() + flush_interval
+        while len(batch) < batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = items.get(timeout=remaining) if remaining > 0 else items.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        flush(batch)
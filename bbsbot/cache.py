@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_key(*parts):
+    """Case- and whitespace-insensitive cache key for a lookup's arguments."""
+    return "|".join(" ".join(str(part).lower().split()) for part in parts)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    Keys are strings; values must be JSON-serializable if the cache is
+    persisted. Hit/miss counters are kept per namespace (the first key part).
+    """
+
+    def __init__(self, max_entries=512, path=None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = path
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.stats = {}  # namespace -> [hits, misses]
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return (True, value) for a live entry, else (False, None)."""
+        now = time.time()
+        namespace = key.split("|", 1)[0]
+        with self.lock:
+            counters = self.stats.setdefault(namespace, [0, 0])
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                counters[0] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self.entries[key]
+            counters[1] += 1
+            return False, None
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time.time() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def totals(self):
+        """Return (hits, misses) across all namespaces."""
+        with self.lock:
+            hits = sum(counters[0] for counters in self.stats.values())
+            misses = sum(counters[1] for counters in self.stats.values())
+        return hits, misses
+
+    def load(self):
+        """Load unexpired entries from self.path, if persistence is enabled."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                stored = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Error loading response cache: {e}")
+            return
+        now = time.time()
+        with self.lock:
+            for key, (expires_at, value) in stored.items():
+                if expires_at > now:
+                    self.entries[key] = (expires_at, value)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        """Write live entries to self.path, if persistence is enabled."""
+        if not self.path:
+            return
+        now = time.time()
+        with self.lock:
+            live = {key: list(entry) for key, entry in self.entries.items() if entry[0] > now}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(live, file)
+        os.replace(tmp_path, self.path)
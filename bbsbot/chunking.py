@@ -0,0 +1,81 @@
+def chunk_message(message, chunk_size):
+    """
+    Break a message into chunks, up to `chunk_size` characters each,
+    ensuring no splits in the middle of words or lines.
+
+    1. Split by newline to preserve paragraph boundaries.
+    2. For each paragraph, break it into word-based lines
+       that do not exceed chunk_size.
+    """
+    final_chunks = []
+    for para in message.split('\n'):
+        # If paragraph is totally empty, keep it as a blank line
+        if not para.strip():
+            final_chunks.append('')
+            continue
+        final_chunks.extend(_pack_words(para.split(), chunk_size))
+    return final_chunks
+
+
+def _pack_words(words, chunk_size):
+    """Greedily pack words into lines of at most chunk_size characters."""
+    lines = []
+    current_line_words = []
+    current_length = 0
+    for word in words:
+        if current_line_words and current_length + 1 + len(word) > chunk_size:
+            lines.append(' '.join(current_line_words))
+            current_line_words = []
+        if current_line_words:
+            current_length += 1 + len(word)
+        else:
+            current_length = len(word)
+        current_line_words.append(word)
+    if current_line_words:
+        lines.append(' '.join(current_line_words))
+    return lines
+
+
+class StreamChunker:
+    """
+    Incremental chunk_message for text that arrives in pieces.
+
+    feed() returns the chunks that can no longer change; finish() flushes
+    the rest. Joined together they match chunk_message(full_text, chunk_size)
+    (minus a trailing blank line), because greedy word packing never
+    revisits a line once the next word doesn't fit.
+    """
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.words = []  # Complete words not yet emitted from the current paragraph
+        self.partial = ""  # Trailing word that may still grow
+
+    def feed(self, text):
+        chunks = []
+        for i, segment in enumerate(text.split('\n')):
+            if i:
+                chunks.extend(self._end_paragraph())
+            self._add(segment, chunks)
+        return chunks
+
+    def finish(self):
+        """Return the chunks for whatever text is left."""
+        if not self.words and not self.partial:
+            return []
+        return self._end_paragraph()
+
+    def _add(self, segment, chunks):
+        text = self.partial + segment
+        words = text.split()
+        self.partial = words.pop() if words and not text[-1].isspace() else ""
+        self.words.extend(words)
+        lines = _pack_words(self.words, self.chunk_size)
+        if len(lines) > 1:
+            chunks.extend(lines[:-1])
+            self.words = lines[-1].split()
+
+    def _end_paragraph(self):
+        words = self.words + ([self.partial] if self.partial else [])
+        self.words, self.partial = [], ""
+        return _pack_words(words, self.chunk_size) if words else ['']
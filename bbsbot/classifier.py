@@ -0,0 +1,85 @@
+"""
+Single-pass classifier for lines coming off the teleconference.
+
+Every pattern is compiled once at import time. A line is stripped of ANSI codes
+once, and a kind's pattern is only tried when a literal the pattern cannot
+match without (" (whispered): ", " just joined this channel!", ...) is in the
+line. Those substring checks run at C speed, so a line usually meets one
+regex instead of a chain of lazy scans.
+"""
+import re
+from collections import namedtuple
+
+ANSI_ESCAPE = re.compile(r'\x1b\[(.*?)m')
+
+# (kind, literal every match contains, pattern); the groups are the kind's fields.
+# Order matters: the whisper and (to you) forms must win over plain "From X:".
+LINE_KINDS = [
+    (kind, literal, re.compile(pattern, re.DOTALL)) for kind, literal, pattern in (
+        ("whisper", " (whispered): ", r'From (.+?) \(whispered\): (.+)'),
+        ("direct", " (to you): ", r'From (.+?) \(to you\): (.+)'),
+        ("public", "From ", r'From (.+?): (.+)'),
+        ("page", " is paging you ", r'(.+?) is paging you (?:from|via) (.+?): (.+)'),
+        ("online", " is now online.", r'(.+?)@(.+?) \(.*?\) is now online\.  Total users: \d+\.'),
+        ("joined", " just joined this channel!", r'([^@]+?)(?:@(.+?))? just joined this channel!'),
+        ("left", " just left this channel!", r'([^@]+?)(?:@(.+?))? just left this channel!'),
+        ("topic", "Topic: (", r'Topic: \(.*?\)\.\s*.*?\s*are here with you\.'),
+        ("here", " here with you.", r'.*?(?:is|are) here with you\.\s*$'),
+        ("separator", ":***", r':\*\*\*\s*$'),
+        ("entrance", "->", r'->\s?(.*)'),
+    )
+]
+
+# Login and pager prompts (lower case) and the name each one reports, for
+# bbsbot.matcher.MultiMatcher over the raw stream.
+PROMPTS = {
+    'please finish up and log off.': "maintenance",
+    'otherwise type "new": ': "username",
+    'type it in and press enter': "username",
+    'enter your password: ': "password",
+    'glad to see you back again.': "greetings",  # "Greetings, <user>, glad to see you back again."
+    '(n)onstop, (q)uit, or (c)ontinue?': "more",
+}
+
+ClassifiedLine = namedtuple("ClassifiedLine", "kind clean fields")
+
+
+def strip_ansi(text):
+    """Remove ANSI color codes from text."""
+    return ANSI_ESCAPE.sub('', text)
+
+
+def classify(line):
+    """
+    Classify one raw line (ANSI codes allowed).
+    Returns ClassifiedLine(kind, clean, fields) where kind is one of the kinds
+    in LINE_KINDS or "other", and fields is a tuple of the captured values.
+    """
+    return classify_clean(ANSI_ESCAPE.sub('', line))
+
+
+def classify_clean(clean):
+    """Classify a line that has already been stripped of ANSI codes."""
+    text = clean.strip()
+    for kind, literal, pattern in LINE_KINDS:
+        if literal in text:
+            match = pattern.match(text)
+            if match:
+                return ClassifiedLine(kind, clean, match.groups())
+    return ClassifiedLine("other", clean, ())
+
+
+# Who-list parsing ("a@x.com, b@y.net and c are here with you.")
+ADDRESS_PATTERN = re.compile(r'\b\S+@\S+\.\S+\b')
+LAST_USER_PATTERN = re.compile(r'and (\S+) are here with you\.')
+SINGLE_USER_PATTERN = re.compile(r'\b(\S+) is here with you\.')
+
+
+def parse_who_list(clean_text):
+    """Return the usernames listed in an ANSI-free who-list."""
+    usernames = [address.split('@')[0] for address in ADDRESS_PATTERN.findall(clean_text)]
+    last_user_match = LAST_USER_PATTERN.search(clean_text)
+    if last_user_match:
+        usernames.append(last_user_match.group(1))
+    usernames.extend(SINGLE_USER_PATTERN.findall(clean_text))
+    return usernames
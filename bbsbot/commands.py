@@ -0,0 +1,82 @@
+import shlex
+
+
+class TriggerContext:
+    """Who sent a trigger, which channel it arrived on, and how to answer it."""
+
+    def __init__(self, sender, channel, reply, module_or_channel=None):
+        self.sender = sender
+        self.channel = channel  # "public", "whisper", "page" or "direct"
+        self.reply = reply
+        self.module_or_channel = module_or_channel
+
+
+class Command:
+    """
+    One entry in the command table.
+
+    nargs=None passes the rest of the line as a single (possibly empty) string.
+    nargs=N splits the rest into N words, the last one keeping any remainder.
+    quoted=True splits the rest shell-style so "quoted phrases" stay together.
+    Inline commands are cheap and run on the caller's thread; the rest go to
+    the worker pool.
+    """
+
+    def __init__(self, token, handler, nargs=None, usage=None, quoted=False, inline=False):
+        self.token = token
+        self.handler = handler
+        self.nargs = nargs
+        self.usage = usage or f"Usage: {token}"
+        self.quoted = quoted
+        self.inline = inline
+
+    def parse_args(self, rest):
+        """Return the handler's positional arguments, or None if rest doesn't fit the spec."""
+        if self.nargs is None:
+            return [rest.strip()]
+        if self.quoted:
+            try:
+                parts = shlex.split(rest)
+            except ValueError:
+                return None
+            if len(parts) < self.nargs:
+                return None
+            return parts[:self.nargs]
+        if self.nargs == 0:
+            return []
+        parts = rest.split(maxsplit=self.nargs - 1)
+        if len(parts) < self.nargs:
+            return None
+        return parts
+
+    def run(self, ctx, args):
+        """Call the handler with the trigger context and parsed arguments."""
+        return self.handler(ctx, *args)
+
+
+class CommandRouter:
+    """Map command tokens such as "!weather" to Command entries."""
+
+    def __init__(self):
+        self.commands = {}
+
+    def register(self, token, handler, **options):
+        self.commands[token.lower()] = Command(token, handler, **options)
+
+    def lookup(self, message):
+        """
+        Split a chat message into (command, rest).
+        The command token must be the first word of the message; otherwise
+        (None, message) is returned.
+        """
+        text = message.strip()
+        if not text.startswith("!"):
+            return None, message
+        parts = text.split(None, 1)
+        command = self.commands.get(parts[0].lower())
+        if command is None:
+            return None, message
+        return command, parts[1] if len(parts) > 1 else ""
+
+    def tokens(self):
+        return list(self.commands)
@@ -0,0 +1,107 @@
+"""
+Settings shared by the bot core and its front ends.
+
+API keys come from api_keys.json and engine tuning from settings.json; both
+files are optional and read once at import time.
+"""
+import json
+import os
+
+# Load API keys from api_keys.json
+def load_api_keys():
+    if os.path.exists("api_keys.json"):
+        with open("api_keys.json", "r") as file:
+            return json.load(file)
+    return {}
+
+api_keys = load_api_keys()
+
+###############################################################################
+# Default/placeholder API keys (updated in Settings window as needed).
+###############################################################################
+DEFAULT_OPENAI_API_KEY = api_keys.get("openai_api_key", "")
+DEFAULT_WEATHER_API_KEY = api_keys.get("weather_api_key", "")
+DEFAULT_YOUTUBE_API_KEY = api_keys.get("youtube_api_key", "")
+DEFAULT_GOOGLE_CSE_KEY = api_keys.get("google_cse_api_key", "")  # Google Custom Search API Key
+DEFAULT_GOOGLE_CSE_CX = api_keys.get("google_cse_cx", "")   # Google Custom Search Engine ID (cx)
+DEFAULT_NEWS_API_KEY = api_keys.get("news_api_key", "")    # NewsAPI Key
+DEFAULT_GOOGLE_PLACES_API_KEY = api_keys.get("google_places_api_key", "")  # Google Places API Key
+DEFAULT_PEXELS_API_KEY = api_keys.get("pexels_api_key", "")  # Pexels API Key
+DEFAULT_ALPHA_VANTAGE_API_KEY = api_keys.get("alpha_vantage_api_key", "")  # Alpha Vantage API Key
+DEFAULT_COINMARKETCAP_API_KEY = api_keys.get("coinmarketcap_api_key", "")  # CoinMarketCap API Key
+DEFAULT_GIPHY_API_KEY = api_keys.get("giphy_api_key", "")  # Add default Giphy API Key
+
+# Load bot tuning settings from settings.json
+def load_bot_settings():
+    if os.path.exists("settings.json"):
+        with open("settings.json", "r") as file:
+            return json.load(file)
+    return {}
+
+bot_settings = load_bot_settings()
+
+###############################################################################
+# Engine tuning (override in settings.json).
+###############################################################################
+DEFAULT_DISPATCH_WORKERS = bot_settings.get("dispatch_workers", 4)  # Trigger handler threads
+DEFAULT_DISPATCH_MAX_PENDING = bot_settings.get("dispatch_max_pending", 64)  # Max queued triggers
+DEFAULT_SCROLLBACK_LINES = bot_settings.get("scrollback_lines", 5000)  # Lines kept in the terminal display
+DEFAULT_SCROLLBACK_PAGE = bot_settings.get("scrollback_page", 500)  # Lines read back from disk per scroll-up
+SCROLLBACK_LOG_FILE = "scrollback.log"
+DEFAULT_HTTP_TIMEOUT = bot_settings.get("http_timeout", 10)  # Seconds per external API request
+DEFAULT_HTTP_RETRIES = bot_settings.get("http_retries", 2)  # Retries with backoff on errors/429/5xx
+DEFAULT_HTTP_POOL_SIZE = bot_settings.get("http_pool_size", 10)  # Keep-alive connections per host
+DEFAULT_API_ENDPOINTS = bot_settings.get("api_endpoints", {})  # Origin overrides, e.g. for mock servers
+DEFAULT_OPENAI_API_BASE = bot_settings.get("openai_api_base")  # e.g. "http://127.0.0.1:9000/v1"
+# Seconds a repeated lookup is served from the response cache, per provider
+DEFAULT_CACHE_TTLS = {
+    "weather": 600,
+    "yt": 3600,
+    "search": 3600,
+    "news": 900,
+    "map": 86400,
+    "pic": 3600,
+    "gif": 3600,
+    "stocks": 300,  # Alpha Vantage allows 25 requests/day
+    "crypto": 60,
+    "podcast": 3600,
+}
+DEFAULT_CACHE_TTLS.update(bot_settings.get("cache_ttls", {}))
+DEFAULT_CACHE_MAX_ENTRIES = bot_settings.get("cache_max_entries", 512)
+DEFAULT_CACHE_FILE = bot_settings.get("cache_file")  # e.g. "response_cache.json" to survive restarts
+DEFAULT_HISTORY_WINDOW = bot_settings.get("history_window", 5)  # Exchanges sent to ChatGPT as context
+HISTORY_MAX_PAGES = 4  # Upper bound on query pages read when loading a user's history
+DEFAULT_DYNAMODB_FLUSH_INTERVAL = bot_settings.get("dynamodb_flush_interval", 2.0)
+DEFAULT_CHATGPT_STREAMING = bot_settings.get("chatgpt_streaming", True)  # Send !chat replies as they are generated
+DEFAULT_SEND_LINES_PER_SECOND = bot_settings.get("send_lines_per_second", 10.0)  # Sustained rate under the BBS flood limit
+DEFAULT_SEND_BURST = bot_settings.get("send_burst", 3)  # Lines that may go out back to back after a pause
+DEFAULT_SEND_MAX_PENDING = bot_settings.get("send_max_pending", 200)  # Queued lines before handlers wait
+# Keep-alive after this many idle seconds; see bbsbot/keepalive.py for the modes
+DEFAULT_KEEPALIVE = {"mode": "auto", "idle": 60}
+DEFAULT_KEEPALIVE.update(bot_settings.get("keepalive", {}))
+KEEPALIVE_PROFILES = {host.lower(): profile for host, profile in bot_settings.get("keepalive_profiles", {}).items()}
+DEFAULT_CONNECT_TIMEOUT = bot_settings.get("connect_timeout", 20)  # Seconds to wait for the telnet connection
+DEFAULT_RECONNECT_DELAY = bot_settings.get("reconnect_delay", 2)  # First retry after a drop, doubled per failure
+DEFAULT_RECONNECT_MAX_DELAY = bot_settings.get("reconnect_max_delay", 300)  # Ceiling for the retry delay
+RECONNECT_STABLE_AFTER = 60  # Seconds a session must stay up before the backoff starts over
+DEFAULT_SILENCE_PROBE = bot_settings.get("silence_probe", 180)  # Seconds of silence before probing the socket
+PROBE_TIMEOUT = 30  # Seconds a probe may go unanswered before the socket counts as half-open
+LOGIN_RESUME_DELAY = 15  # Seconds a reconnected session waits for a login prompt before logging on anyway
+DEFAULT_PENDING_INDEX_REFRESH = bot_settings.get("pending_index_refresh", 900)  # Seconds between pending-mail rescans
+DEFAULT_LAST_SEEN_FLUSH_INTERVAL = bot_settings.get("last_seen_flush_interval", 30)  # Seconds between journal appends
+LAST_SEEN_RESOLUTION = 60  # Seconds a last-seen time may lag before it is written again
+LAST_SEEN_COMPACT_AFTER = 500  # Journal lines before they are folded into last_seen.json
+SEEN_MAX_NAMES = 5  # Names one !seen may ask about
+DEFAULT_SAID_HISTORY_SIZE = bot_settings.get("said_history_size", 5000)  # Public lines kept per room for !said
+SAID_LINES_PER_USER = 50  # Lines per user reachable through !said <user> N
+SAID_MAX_LINES = 10  # Most lines one !said answers with
+SAID_SAVE_INTERVAL = 60  # Seconds between saves of public_message_history.json
+DEFAULT_TRANSCRIPT_DB = bot_settings.get("transcript_db", "transcript.db")  # SQLite file of every chat line, for !grep
+TRANSCRIPT_BATCH_SIZE = 500  # Most lines written to the transcript in one transaction
+TRANSCRIPT_FLUSH_INTERVAL = 2.0  # Seconds a transcript line may wait to be written
+GREP_MAX_RESULTS = 5  # Lines one !grep answers with
+TRANSCRIPT_SEARCH_RESULTS = 200  # Lines the GUI Search window lists
+DEFAULT_MEMBERSHIP_MAX_AGE = bot_settings.get("membership_max_age", 300)  # Seconds before a who-list is re-requested
+FIRST_WHO_LIST_WAIT = 1.0  # Seconds a handler waits for the very first who-list of a session
+DEFAULT_LOG_LEVEL = bot_settings.get("log_level", "INFO")  # Set to "DEBUG" for per-line traces
+IDLE_POLL_MS = 1000  # Safety poll in case a wake-up event is lost
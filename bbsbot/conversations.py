@@ -0,0 +1,128 @@
+import queue
+import threading
+from collections import OrderedDict, deque
+
+from bbsbot.batching import drain_in_batches
+
+
+def reassemble_exchanges(items):
+    """
+    Turn conversation items, oldest first, into {'message', 'response'} dicts.
+
+    Current items hold a whole exchange and carry 'parts'. Older items split
+    the response into 250-character chunks written one timestamp apart with
+    the same message; consecutive chunks like that are joined back together.
+    """
+    exchanges = []
+    previous = None
+    for item in items:
+        legacy_chunk = (
+            'parts' not in item
+            and previous is not None
+            and 'parts' not in previous
+            and item['message'] == previous['message']
+            and item['timestamp'] == previous['timestamp'] + 1
+        )
+        if legacy_chunk:
+            exchanges[-1]['response'] += item['response']
+        else:
+            exchanges.append({'message': item['message'], 'response': item['response']})
+        previous = item
+    return exchanges
+
+
+class ConversationStore:
+    """
+    In-memory recent-history window per user, kept in LRU order.
+
+    Only the last `window` exchanges are held for each user and at most
+    `max_users` users are kept; the least recently used user is dropped first.
+    A user missing from the store is loaded once through `loader(username)`,
+    which returns a list of {'message', 'response'} dicts oldest first.
+    """
+
+    def __init__(self, loader, window=5, max_users=256):
+        self.loader = loader
+        self.window = max(1, int(window))
+        self.max_users = max(1, int(max_users))
+        self.histories = OrderedDict()  # username -> deque of exchanges
+        self.lock = threading.Lock()
+
+    def recent(self, username):
+        """Return the recent exchanges for username, oldest first."""
+        with self.lock:
+            history = self.histories.get(username)
+            if history is not None:
+                self.histories.move_to_end(username)
+                return list(history)
+        # Load outside the lock so one slow backend read doesn't stall other users
+        loaded = self.loader(username)[-self.window:]
+        with self.lock:
+            history = self.histories.get(username)
+            if history is None:
+                history = deque(loaded, maxlen=self.window)
+                self._store(username, history)
+            return list(history)
+
+    def append(self, username, message, response):
+        """Record a new exchange locally; the caller persists it."""
+        exchange = {'message': message, 'response': response}
+        with self.lock:
+            history = self.histories.get(username)
+            if history is None:
+                # Not loaded yet: the backend read on first use will include it
+                return
+            history.append(exchange)
+            self.histories.move_to_end(username)
+
+    def _store(self, username, history):
+        self.histories[username] = history
+        self.histories.move_to_end(username)
+        while len(self.histories) > self.max_users:
+            self.histories.popitem(last=False)
+
+
+class WriteBehindQueue:
+    """
+    Batch DynamoDB puts on a background thread.
+
+    put() returns immediately; items are written through the table's
+    batch_writer in groups of up to `batch_size`; a batch is written no later
+    than `flush_interval` seconds after its first item was queued. stop()
+    drains whatever is still queued.
+    """
+
+    def __init__(self, table, batch_size=25, flush_interval=2.0, key_names=None):
+        self.table = table
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.key_names = key_names  # primary key attributes, lets the batch dedupe overwrites
+        self.items = queue.Queue()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="dynamodb-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=10):
+        """Flush queued items and stop the writer thread."""
+        if self.thread is None:
+            return
+        self.items.put(None)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def put(self, item):
+        self.items.put(item)
+
+    def _run(self):
+        drain_in_batches(self.items, self.batch_size, self.flush_interval, self._write)
+
+    def _write(self, batch):
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=self.key_names) as writer:
+                for item in batch:
+                    writer.put_item(Item=item)
+        except Exception as e:
+            print(f"Error writing {len(batch)} item(s) to DynamoDB: {e}")
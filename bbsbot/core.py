@@ -0,0 +1,2139 @@
+"""
+Bot engine: the telnet session, trigger parsing and command handlers.
+
+BotCore has no GUI dependencies. Front ends attach by setting core.frontend
+to an object with show_text(text), show_lines(lines) and
+connection_changed(connected); all may be called from any thread.
+show_lines receives the framer's FramedLines for text read from the BBS. Settings are objects with get()/set(), made
+by the `variable` factory so a Tk front end can bind widgets to them directly.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import smtplib
+import subprocess
+import sys
+import threading
+import time
+from email.mime.text import MIMEText
+
+import boto3
+import openai
+import requests
+import telnetlib3
+from bs4 import BeautifulSoup
+
+from bbsbot.cache import TTLCache, normalize_key
+from bbsbot.chunking import StreamChunker, chunk_message
+from bbsbot.classifier import PROMPTS, classify, classify_clean, parse_who_list
+from bbsbot.commands import CommandRouter, TriggerContext
+from bbsbot.config import (
+    DEFAULT_ALPHA_VANTAGE_API_KEY,
+    DEFAULT_API_ENDPOINTS,
+    DEFAULT_CACHE_FILE,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_TTLS,
+    DEFAULT_CHATGPT_STREAMING,
+    DEFAULT_COINMARKETCAP_API_KEY,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DISPATCH_MAX_PENDING,
+    DEFAULT_DISPATCH_WORKERS,
+    DEFAULT_DYNAMODB_FLUSH_INTERVAL,
+    DEFAULT_GIPHY_API_KEY,
+    DEFAULT_GOOGLE_CSE_CX,
+    DEFAULT_GOOGLE_CSE_KEY,
+    DEFAULT_GOOGLE_PLACES_API_KEY,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_HTTP_POOL_SIZE,
+    DEFAULT_HTTP_RETRIES,
+    DEFAULT_HTTP_TIMEOUT,
+    DEFAULT_LAST_SEEN_FLUSH_INTERVAL,
+    DEFAULT_MEMBERSHIP_MAX_AGE,
+    DEFAULT_NEWS_API_KEY,
+    DEFAULT_OPENAI_API_BASE,
+    DEFAULT_OPENAI_API_KEY,
+    DEFAULT_PENDING_INDEX_REFRESH,
+    DEFAULT_PEXELS_API_KEY,
+    DEFAULT_RECONNECT_DELAY,
+    DEFAULT_RECONNECT_MAX_DELAY,
+    DEFAULT_SAID_HISTORY_SIZE,
+    DEFAULT_SEND_BURST,
+    DEFAULT_SEND_LINES_PER_SECOND,
+    DEFAULT_SEND_MAX_PENDING,
+    DEFAULT_SILENCE_PROBE,
+    DEFAULT_TRANSCRIPT_DB,
+    DEFAULT_WEATHER_API_KEY,
+    DEFAULT_YOUTUBE_API_KEY,
+    FIRST_WHO_LIST_WAIT,
+    GREP_MAX_RESULTS,
+    HISTORY_MAX_PAGES,
+    LAST_SEEN_COMPACT_AFTER,
+    LAST_SEEN_RESOLUTION,
+    LOGIN_RESUME_DELAY,
+    PROBE_TIMEOUT,
+    RECONNECT_STABLE_AFTER,
+    SAID_LINES_PER_USER,
+    SAID_MAX_LINES,
+    SAID_SAVE_INTERVAL,
+    SEEN_MAX_NAMES,
+    TRANSCRIPT_BATCH_SIZE,
+    TRANSCRIPT_FLUSH_INTERVAL,
+)
+from bbsbot.conversations import ConversationStore, WriteBehindQueue, reassemble_exchanges
+from bbsbot.dispatch import TriggerDispatcher
+from bbsbot.framer import LineFramer
+from bbsbot.history import PublicHistory, parse_span
+from bbsbot.httpclient import HTTPClient
+from bbsbot.keepalive import keepalive_profile, send_keepalive
+from bbsbot.login import LoginFlow
+from bbsbot.matcher import MultiMatcher
+from bbsbot.outbound import OutboundQueue
+from bbsbot.pending import RecipientIndex
+from bbsbot.presence import LastSeenStore, format_age, normalize_name
+from bbsbot.reconnect import Backoff, enable_tcp_keepalive
+from bbsbot.roomstate import RoomState
+from bbsbot.transcript import TranscriptIndex
+
+logger = logging.getLogger("ultron")
+
+# Initialize DynamoDB client
+dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+table_name = 'ChatBotConversations'
+table = dynamodb.Table(table_name)
+pending_messages_table_name = 'PendingMessages'
+
+
+class Setting:
+    """A settings value with the get()/set() interface of a Tk variable."""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Frontend:
+    """Front end that discards everything; the core uses it until one is attached."""
+
+    def show_text(self, text):
+        pass
+
+    def show_lines(self, lines):
+        pass
+
+    def connection_changed(self, connected):
+        pass
+
+
+class BotServices:
+    """
+    Resources shared by every session in the process: the event loop and its
+    thread, the trigger worker pool, the HTTP client, the response cache, the
+    DynamoDB tables and conversation store, and the last-seen table.
+    """
+
+    def __init__(self):
+        # Event loop for the telnet sessions, run by start() on its own thread
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = None
+
+        # Worker pool that runs trigger handlers off the event loop
+        self.dispatcher = TriggerDispatcher(
+            workers=DEFAULT_DISPATCH_WORKERS,
+            max_pending=DEFAULT_DISPATCH_MAX_PENDING
+        )
+
+        # Pooled HTTP session shared by every external API lookup
+        self.http = HTTPClient(
+            timeout=DEFAULT_HTTP_TIMEOUT,
+            retries=DEFAULT_HTTP_RETRIES,
+            pool_size=max(DEFAULT_HTTP_POOL_SIZE, DEFAULT_DISPATCH_WORKERS),
+            endpoints=DEFAULT_API_ENDPOINTS
+        )
+        if DEFAULT_OPENAI_API_BASE:
+            openai.api_base = DEFAULT_OPENAI_API_BASE
+
+        # Response cache in front of the external lookups
+        self.response_cache = TTLCache(DEFAULT_CACHE_MAX_ENTRIES, DEFAULT_CACHE_FILE)
+        self.response_cache.load()
+
+        self.dynamodb_client = boto3.client('dynamodb', region_name='us-east-1')
+        self.table_name = table_name
+        self.pending_messages_table_name = pending_messages_table_name
+        self.create_dynamodb_table()
+        self.create_pending_messages_table()
+        # Who has mail waiting, so who-lists only query DynamoDB for them
+        self.pending_index = RecipientIndex(max_age=DEFAULT_PENDING_INDEX_REFRESH)
+        self.pending_index.load(dynamodb.Table(self.pending_messages_table_name))
+        # Recent ChatGPT context is served from memory; writes reach DynamoDB in batches
+        self.conversations = ConversationStore(self.get_conversation_history, window=DEFAULT_HISTORY_WINDOW)
+        self.conversation_writer = WriteBehindQueue(
+            table, flush_interval=DEFAULT_DYNAMODB_FLUSH_INTERVAL, key_names=['username', 'timestamp']
+        )
+
+        # Last-seen times: written to a journal in batches, compacted into last_seen.json
+        self.last_seen = LastSeenStore(
+            "last_seen.json",
+            flush_interval=DEFAULT_LAST_SEEN_FLUSH_INTERVAL,
+            resolution=LAST_SEEN_RESOLUTION,
+            compact_after=LAST_SEEN_COMPACT_AFTER
+        )
+        self.last_seen.load()
+
+        # Every public, whispered and paged line, searchable with !grep
+        self.transcript = TranscriptIndex(
+            DEFAULT_TRANSCRIPT_DB, batch_size=TRANSCRIPT_BATCH_SIZE, flush_interval=TRANSCRIPT_FLUSH_INTERVAL
+        )
+        self.transcript.open()
+
+    def start(self):
+        """Start the event loop thread and the background workers."""
+        if self.loop_thread:
+            return
+        self.dispatcher.start()
+        self.conversation_writer.start()
+        self.last_seen.start()
+        self.transcript.start()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, name="telnet-loop", daemon=True)
+        self.loop_thread.start()
+
+    def shutdown(self):
+        """Flush pending writes and stop the background threads."""
+        self.dispatcher.stop()
+        self.http.close()
+        self.conversation_writer.stop()
+        self.last_seen.stop()
+        try:
+            self.response_cache.save()
+        except OSError as e:
+            print(f"Error saving response cache: {e}")
+        if self.loop_thread:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join(5)
+            if not self.loop_thread.is_alive():
+                # Let cancelled sessions unwind instead of being destroyed while pending
+                pending = asyncio.all_tasks(self.loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self.loop.run_until_complete(asyncio.wait(pending))
+            self.loop_thread = None
+        self.transcript.stop()  # Last, so lines read while disconnecting are written too
+
+    def create_dynamodb_table(self):
+        """Create DynamoDB table if it doesn't exist."""
+        try:
+            self.dynamodb_client.describe_table(TableName=self.table_name)
+        except self.dynamodb_client.exceptions.ResourceNotFoundException:
+            self.dynamodb_client.create_table(
+                TableName=self.table_name,
+                KeySchema=[
+                    {'AttributeName': 'username', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'username', 'AttributeType': 'S'},
+                    {'AttributeName': 'timestamp', 'AttributeType': 'N'}
+                ],
+                ProvisionedThroughput={
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            )
+            self.dynamodb_client.get_waiter('table_exists').wait(TableName=self.table_name)
+
+    def create_pending_messages_table(self):
+        """Create DynamoDB table for pending messages if it doesn't exist."""
+        try:
+            self.dynamodb_client.describe_table(TableName=self.pending_messages_table_name)
+        except self.dynamodb_client.exceptions.ResourceNotFoundException:
+            self.dynamodb_client.create_table(
+                TableName=self.pending_messages_table_name,
+                KeySchema=[
+                    {'AttributeName': 'recipient', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'recipient', 'AttributeType': 'S'},
+                    {'AttributeName': 'timestamp', 'AttributeType': 'N'}
+                ],
+                ProvisionedThroughput={
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            )
+            self.dynamodb_client.get_waiter('table_exists').wait(TableName=self.pending_messages_table_name)
+
+    def get_conversation_history(self, username, limit=DEFAULT_HISTORY_WINDOW):
+        """Retrieve the last `limit` exchanges for username from DynamoDB, oldest first."""
+        query_args = {
+            'KeyConditionExpression': boto3.dynamodb.conditions.Key('username').eq(username),
+            'ScanIndexForward': False,  # Newest first, so Limit keeps the most recent items
+            'Limit': limit * 2,
+        }
+        items = []
+        exchanges = []
+        try:
+            for _ in range(HISTORY_MAX_PAGES):
+                response = table.query(**query_args)
+                items.extend(response.get('Items', []))
+                exchanges = reassemble_exchanges(reversed(items))
+                # One extra exchange guarantees the oldest one kept isn't missing older chunks
+                if len(exchanges) > limit or 'LastEvaluatedKey' not in response:
+                    break
+                query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            print(f"Error retrieving conversation history from DynamoDB: {e}")
+        return exchanges[-limit:]
+
+
+class BotCore:
+    def __init__(self, variable=Setting, services=None, name="default"):
+        self.frontend = Frontend()
+        self.name = name  # Identifies this session in logs, dispatcher keys and ChatRoomMembers
+
+        # Shared resources; a core made on its own gets a private set
+        self.owns_services = services is None
+        self.services = services or BotServices()
+        self.loop = self.services.loop
+        self.dispatcher = self.services.dispatcher
+        self.http = self.services.http
+        self.response_cache = self.services.response_cache
+        self.conversations = self.services.conversations
+        self.conversation_writer = self.services.conversation_writer
+        self.last_seen = self.services.last_seen
+        self.transcript = self.services.transcript
+
+        # ----------------- Configurable variables ------------------
+        self.host = variable("bbs.example.com")
+        self.port = variable(23)
+        self.openai_api_key = variable(DEFAULT_OPENAI_API_KEY)
+        self.weather_api_key = variable(DEFAULT_WEATHER_API_KEY)
+        self.youtube_api_key = variable(DEFAULT_YOUTUBE_API_KEY)
+        self.google_cse_api_key = variable(DEFAULT_GOOGLE_CSE_KEY)
+        self.google_cse_cx = variable(DEFAULT_GOOGLE_CSE_CX)
+        self.news_api_key = variable(DEFAULT_NEWS_API_KEY)
+        self.google_places_api_key = variable(DEFAULT_GOOGLE_PLACES_API_KEY)
+        self.pexels_api_key = variable(DEFAULT_PEXELS_API_KEY)  # Ensure Pexels API Key is loaded
+        self.nickname = variable(self.load_nickname())
+        self.username = variable(self.load_username())
+        self.password = variable(self.load_password())
+        self.remember_username = variable(False)
+        self.remember_password = variable(False)
+        self.in_teleconference = False  # Flag to track teleconference state
+        self.mud_mode = variable(False)
+        self.alpha_vantage_api_key = variable(DEFAULT_ALPHA_VANTAGE_API_KEY)  # Ensure Alpha Vantage API Key is loaded
+        self.coinmarketcap_api_key = variable(DEFAULT_COINMARKETCAP_API_KEY)  # Ensure CoinMarketCap API Key is loaded
+        self.logon_automation_enabled = variable(False)  # Correct initialization
+        self.auto_login_enabled = variable(False)  # Add Auto Login toggle
+        self.giphy_api_key = variable(DEFAULT_GIPHY_API_KEY)  # Add Giphy API Key
+        self.no_spam_mode = variable(self.load_no_spam_state())  # Initialize using saved state
+        # Recent public lines for !said, in a fixed-size ring saved across restarts
+        self.public_history = PublicHistory(
+            self.session_file("public_message_history.json"),
+            capacity=DEFAULT_SAID_HISTORY_SIZE,
+            per_user=SAID_LINES_PER_USER,
+            save_interval=SAID_SAVE_INTERVAL
+        )
+        self.public_history.load()
+
+        # Terminal mode (ANSI only)
+        self.terminal_mode = variable("ANSI")
+
+        # Telnet references
+        self.reader = None
+        self.writer = None
+        self.stop_event = threading.Event()  # signals the read loop to stop
+        self.connected = False
+        self.supervisor = None  # Future for supervise_connection while the session is wanted
+        self.connection_id = 0  # Bumped on every new connection, so stale callbacks can tell
+        self.backoff = Backoff(DEFAULT_RECONNECT_DELAY, DEFAULT_RECONNECT_MAX_DELAY)
+        # Paced writer for everything sent to the BBS
+        self.outbound = OutboundQueue(
+            lines_per_second=DEFAULT_SEND_LINES_PER_SECOND,
+            burst=DEFAULT_SEND_BURST,
+            max_pending=DEFAULT_SEND_MAX_PENDING
+        )
+
+        # Command table shared by public, whisper, page and direct triggers
+        self.commands = self.build_command_registry()
+
+        # Splits the telnet stream into decoded lines; replaced on each connection
+        self.framer = LineFramer()
+        # Prompts are watched for in the raw stream, across read boundaries
+        self.prompt_matcher = MultiMatcher(PROMPTS)
+        self.login = LoginFlow(
+            self.send_username,
+            self.send_password,
+            lambda: self.call_later(1, self.send_teleconference_command)
+        )
+
+        self.favorites = self.load_favorites()  # Load favorite BBS addresses
+
+        self.room = RoomState()  # Channel membership, kept current from the stream
+        self.saved_members = None  # Member set last written to ChatRoomMembers
+
+        self.keep_alive_stop_event = threading.Event()
+        self.keep_alive_task = None
+        self.keepalive = keepalive_profile(self.host.get())  # Chosen per board in start_connection
+        self.last_received = time.monotonic()  # When the BBS last sent anything
+        self.last_keepalive = 0.0
+
+        self.previous_line = ""  # Store the previous line to detect multi-line triggers
+        self.user_list_buffer = []  # Buffer to accumulate user list lines
+        self.timers = {}  # Dictionary to store active timers
+        self.auto_greeting_enabled = False  # Default auto-greeting to off
+        self.pending_messages_table_name = pending_messages_table_name
+        self.pending_index = self.services.pending_index
+        openai.api_key = self.openai_api_key.get()
+
+    def start(self):
+        """Start the shared event loop and workers, if they aren't running yet."""
+        self.services.start()
+        self.public_history.start()
+
+    def shutdown(self):
+        """Disconnect; a core that owns its services also stops them."""
+        if self.connected or self.supervisor:
+            try:
+                asyncio.run_coroutine_threadsafe(self.disconnect_from_bbs(), self.loop).result(10)
+            except Exception as e:
+                print(f"Error during disconnect: {e}")
+        self.public_history.stop()
+        if self.owns_services:
+            self.services.shutdown()
+
+    def session_file(self, filename):
+        """Where this session keeps filename: as is for the default session, else prefixed with its address."""
+        if self.name == "default":
+            return filename
+        return re.sub(r'[^\w.-]+', '_', self.name) + "." + filename
+
+    def call_later(self, delay, func, *args):
+        """Run func(*args) on the event loop after delay seconds; safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self.loop.call_later, delay, func, *args)
+
+    def append_terminal_text(self, text, default_tag="normal"):
+        """Pass text (ANSI codes included) to the front end for display."""
+        self.frontend.show_text(text)
+
+    def save_conversation(self, username, message, response):
+        """Record an exchange locally and queue it for DynamoDB as a single item."""
+        self.conversations.append(username, message, response)
+        self.conversation_writer.put({
+            'username': username,
+            'timestamp': int(time.time() * 1000),  # Milliseconds, so quick exchanges don't collide
+            'message': message,
+            'response': response,
+            'parts': 1
+        })
+
+    def save_pending_message(self, recipient, sender, message):
+        """Save a pending message to DynamoDB."""
+        timestamp = int(time.time())
+        pending_messages_table = dynamodb.Table(self.pending_messages_table_name)
+        pending_messages_table.put_item(
+            Item={
+                'recipient': recipient.lower(),
+                'timestamp': timestamp,
+                'sender': sender,
+                'message': message
+            }
+        )
+        self.pending_index.add(recipient)
+
+    def get_pending_messages(self, recipient):
+        """Retrieve pending messages for a recipient from DynamoDB."""
+        pending_messages_table = dynamodb.Table(self.pending_messages_table_name)
+        response = pending_messages_table.query(
+            KeyConditionExpression=boto3.dynamodb.conditions.Key('recipient').eq(recipient.lower())
+        )
+        return response.get('Items', [])
+
+    def delete_pending_messages(self, recipient, timestamps):
+        """Delete delivered messages from DynamoDB, up to 25 per BatchWriteItem."""
+        pending_messages_table = dynamodb.Table(self.pending_messages_table_name)
+        with pending_messages_table.batch_writer() as batch:
+            for timestamp in timestamps:
+                batch.delete_item(
+                    Key={
+                        'recipient': recipient.lower(),
+                        'timestamp': timestamp
+                    }
+                )
+
+    def save_api_keys(self):
+        """Save API keys to a file."""
+        api_keys = {
+            "openai_api_key": self.openai_api_key.get(),
+            "weather_api_key": self.weather_api_key.get(),
+            "youtube_api_key": self.youtube_api_key.get(),
+            "google_cse_api_key": self.google_cse_api_key.get(),
+            "google_cse_cx": self.google_cse_cx.get(),
+            "news_api_key": self.news_api_key.get(),
+            "google_places_api_key": self.google_places_api_key.get(),
+            "pexels_api_key": self.pexels_api_key.get(),
+            "alpha_vantage_api_key": self.alpha_vantage_api_key.get(),
+            "coinmarketcap_api_key": self.coinmarketcap_api_key.get(),
+            "giphy_api_key": self.giphy_api_key.get()  # Save Giphy API Key
+        }
+        with open("api_keys.json", "w") as file:
+            json.dump(api_keys, file)
+        openai.api_key = self.openai_api_key.get()
+
+    def load_api_keys(self):
+        """Load API keys from a file."""
+        if os.path.exists("api_keys.json"):
+            with open("api_keys.json", "r") as file:
+                api_keys = json.load(file)
+                self.openai_api_key.set(api_keys.get("openai_api_key", ""))
+                self.weather_api_key.set(api_keys.get("weather_api_key", ""))
+                self.youtube_api_key.set(api_keys.get("youtube_api_key", ""))
+                self.google_cse_api_key.set(api_keys.get("google_cse_api_key", ""))
+                self.google_cse_cx.set(api_keys.get("google_cse_cx", ""))
+                self.news_api_key.set(api_keys.get("news_api_key", ""))
+                self.google_places_api_key.set(api_keys.get("google_places_api_key", ""))
+                self.pexels_api_key.set(api_keys.get("pexels_api_key", ""))  # Ensure Pexels API Key is loaded
+                self.alpha_vantage_api_key.set(api_keys.get("alpha_vantage_api_key", ""))  # Ensure Alpha Vantage API Key is loaded
+                self.coinmarketcap_api_key.set(api_keys.get("coinmarketcap_api_key", ""))  # Ensure CoinMarketCap API Key is loaded
+                self.giphy_api_key.set(api_keys.get("giphy_api_key", ""))  # Ensure Giphy API Key is loaded
+
+    def connect_to_bbs(self, address):
+        """Connect to the BBS with the given address."""
+        self.host.set(address)
+        self.start_connection()
+
+    def start_connection(self):
+        """
+        Start the connection supervisor on the event loop thread. If one is
+        already waiting to reconnect, it is replaced, so this also means "retry now".
+        """
+        host = self.host.get()
+        port = self.port.get()
+        self.stop_event.clear()
+
+        if self.supervisor:
+            self.supervisor.cancel()
+        self.backoff.reset()
+        self.keepalive = keepalive_profile(host)
+        self.supervisor = asyncio.run_coroutine_threadsafe(self.supervise_connection(host, port), self.loop)
+        self.append_terminal_text(f"Connecting to {host}:{port}...\n", "normal")
+        self.start_keep_alive()  # Start keep-alive coroutine
+
+    async def supervise_connection(self, host, port):
+        """
+        Keep a session to host:port open until disconnect_from_bbs() is called.
+
+        A failed or lost connection is retried after a jittered exponential
+        backoff; the backoff starts over once a session has stayed up for a
+        while. Reconnected sessions log on again when automation is enabled.
+        """
+        reconnecting = False
+        while not self.stop_event.is_set():
+            started = self.loop.time()
+            if await self.telnet_client_task(host, port, reconnecting):
+                reconnecting = True
+                if self.loop.time() - started > RECONNECT_STABLE_AFTER:
+                    self.backoff.reset()
+            if self.stop_event.is_set():
+                break
+            delay = self.backoff.next_delay()
+            self.append_terminal_text(f"Reconnecting to {host}:{port} in {delay:.0f}s...\n")
+            await asyncio.sleep(delay)
+
+    async def telnet_client_task(self, host, port, reconnecting=False):
+        """
+        Connect once via telnetlib3 (CP437 + ANSI) and read until the
+        connection ends. Returns True if the connection was established.
+        """
+        try:
+            reader, writer = await asyncio.wait_for(
+                telnetlib3.open_connection(
+                    host=host,
+                    port=port,
+                    term=self.terminal_mode.get().lower(),
+                    encoding='cp437',
+                    cols=136  # Set terminal width to 136 columns
+                ),
+                DEFAULT_CONNECT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            self.append_terminal_text(f"Connection to {host}:{port} timed out\n")
+            return False
+        except Exception as e:
+            self.append_terminal_text(f"Connection failed: {e}\n")
+            return False
+
+        try:
+            enable_tcp_keepalive(writer.get_extra_info('socket'))
+        except (OSError, AttributeError) as e:
+            logger.debug("TCP keep-alive not enabled: %s", e)
+
+        self.reader = reader
+        self.writer = writer
+        self.framer = LineFramer()
+        self.prompt_matcher.reset()
+        self.login.reset()
+        self.outbound.start(self.loop, writer)
+        self.connected = True
+        self.connection_id += 1
+        self.frontend.connection_changed(True)
+        self.append_terminal_text(f"Connected to {host}:{port}\n")
+        if reconnecting and (self.auto_login_enabled.get() or self.logon_automation_enabled.get()):
+            # Prompts normally drive the logon; start it if none is recognised in time
+            self.loop.call_later(LOGIN_RESUME_DELAY, self.resume_login, self.connection_id)
+
+        try:
+            await self.read_until_closed(reader)
+        except Exception as e:
+            self.append_terminal_text(f"Error reading from server: {e}\n")
+        finally:
+            self.close_connection()
+        return True
+
+    async def read_until_closed(self, reader):
+        """
+        Feed reads to process_data_chunk until EOF or a stop request.
+
+        After DEFAULT_SILENCE_PROBE seconds with nothing received, a keep-alive
+        of the board's profile is sent as a probe. An ENTER must draw an answer
+        within PROBE_TIMEOUT or the socket is taken to be half-open and the
+        read ends. A telnet NOP draws none; a dead peer then shows up as a
+        write error, as it does under mode "off" through the TCP keepalive
+        enabled on the socket, so nothing is typed into a quiet room.
+        """
+        probing = False
+        while not self.stop_event.is_set():
+            try:
+                data = await asyncio.wait_for(reader.read(4096), PROBE_TIMEOUT if probing else DEFAULT_SILENCE_PROBE)
+            except asyncio.TimeoutError:
+                if probing:
+                    self.append_terminal_text("No response from the BBS; dropping the connection.\n")
+                    return
+                sent = send_keepalive(self.writer, self.keepalive["mode"], self.send_enter_keystroke)
+                if sent:
+                    self.last_keepalive = time.monotonic()
+                probing = sent == "enter"
+                continue
+            if not data:
+                return
+            probing = False
+            self.last_received = time.monotonic()
+            logger.debug("Incoming message: %r", data)
+            self.process_data_chunk(data)
+
+    def resume_login(self, connection_id):
+        """Start the logon on a reconnected session if the prompts haven't already."""
+        if connection_id == self.connection_id and self.connected and self.login.state == LoginFlow.WAITING:
+            self.auto_login_sequence()
+
+    def close_connection(self):
+        """Close the current connection; the supervisor decides whether to reconnect. Loop thread only."""
+        if not self.connected:
+            return
+        self.outbound.close()
+        if self.writer:
+            try:
+                self.writer.close()
+            except Exception as e:
+                print(f"Error closing writer: {e}")
+
+        self.connected = False
+        self.reader = None
+        self.writer = None
+        self.room.clear()  # Rebuilt from the next session's who-list
+
+        self.frontend.connection_changed(False)
+        self.append_terminal_text("Disconnected from BBS.\n")
+
+    def auto_login_sequence(self):
+        """Log on now: send the username and let the BBS prompts drive the rest."""
+        if self.connected and self.writer:
+            self.login.start()
+
+    def handle_prompt(self, name):
+        """React to a prompt the matcher found in the stream."""
+        if name == "maintenance":
+            self.handle_cleanup_maintenance()
+        elif name == "more":
+            self.send_enter_keystroke()
+        elif self.login.in_progress or self.auto_login_enabled.get() or self.logon_automation_enabled.get():
+            self.login.on_prompt(name)
+
+    def send_teleconference_command(self):
+        """Send '/go tele' and press ENTER."""
+        if self.connected and self.writer:
+            self.send_raw('/go tele\r\n')
+
+    async def disconnect_from_bbs(self):
+        """Close the session and stop reconnecting."""
+        self.stop_event.set()
+        self.stop_keep_alive()  # Stop keep-alive coroutine
+        if self.supervisor:
+            self.supervisor.cancel()
+            self.supervisor = None
+        if self.connected:
+            self.close_connection()
+        else:
+            self.frontend.connection_changed(False)  # Not connected, but no longer retrying either
+
+    def dispatch_trigger(self, key, func, *args, on_result=None, **kwargs):
+        """
+        Run a trigger handler on the worker pool.
+        Handlers for the same key (username) run in order; on_result receives the
+        handler's return value on the dispatcher's delivery thread.
+        """
+        if not self.dispatcher.submit((self.name, key), func, *args, on_result=on_result, **kwargs):
+            self.append_terminal_text(f"Trigger queue is full, dropped {func.__name__} for {key}.\n", "normal")
+
+    def process_data_chunk(self, data):
+        """
+        Feed a read to the framer, then display and parse triggers for each
+        line it completes. The framer decodes ANSI once per line; the display
+        gets its styled segments and the parser its clean text.
+        """
+        lines = self.framer.feed(data)
+        if lines:
+            self.frontend.show_lines(lines)
+
+        for line in lines:
+            logger.debug("Incoming line: %s", line.clean)
+
+            classified = classify_clean(line.clean)
+            if classified.kind in ("public", "whisper", "page"):
+                # Only queued here; the transcript writer thread stores it
+                self.transcript.add(self.name, classified.kind, classified.fields[0], classified.fields[-1])
+            self.parse_incoming_triggers(line.raw, classified)
+
+            # If line contains '@', it might be part of the user list
+            if "@" in classified.clean:
+                self.user_list_buffer.append(classified.clean)
+
+            # If line ends with "are here with you." or "is here with you.", parse the entire buffer
+            if classified.kind in ("here", "topic"):
+                if classified.clean not in self.user_list_buffer:
+                    self.user_list_buffer.append(classified.clean)
+                self.update_chat_members(self.user_list_buffer)
+                self.user_list_buffer = []
+            elif classified.kind == "joined":
+                username = classified.fields[0]
+                is_new = self.room.join(username)
+                # Greet arrivals announced after the ":***" separator who weren't already listed
+                if is_new and self.previous_line == ":***" and self.auto_greeting_enabled:
+                    self.dispatch_trigger(username, self.handle_user_greeting, username)
+            elif classified.kind == "left":
+                self.room.leave(classified.fields[0])
+            elif classified.kind == "online":
+                self.room.came_online(classified.fields[0])
+            self.previous_line = classified.clean.strip()
+
+        # Login, pager and maintenance prompts, matched in one pass over the read
+        for name in self.prompt_matcher.feed(data):
+            self.handle_prompt(name)
+
+    @property
+    def chat_members(self):
+        """Usernames in the channel, from the latest room snapshot."""
+        return self.room.snapshot.members
+
+    def update_chat_members(self, lines_with_users):
+        """
+        Full sync of the room from a who-list. Called on the loop thread.
+
+        lines_with_users: ANSI-free lines that contain '@', culminating in 'are here with you.'
+        We'll combine them all, then parse out the user@host addresses and usernames.
+        The room snapshot is replaced at once; saving it, the last-seen times and
+        pending-message delivery happen on the worker pool.
+        """
+        combined_clean = " ".join(lines_with_users)  # join with space
+        logger.debug("Combined user lines: %s", combined_clean)
+
+        usernames = parse_who_list(combined_clean)
+        logger.debug("Extracted usernames: %s", usernames)
+
+        self.room.sync(usernames)
+        self.dispatch_trigger("chat_members", self.record_chat_members, usernames)
+
+    def record_chat_members(self, usernames):
+        """Persist a synced member list and deliver waiting messages."""
+        members = frozenset(usernames)
+        if members != self.saved_members:
+            self.save_chat_members(members)  # Only when membership actually changed
+        self.last_seen.touch(usernames)  # Journaled in the background
+
+        logger.debug("Updated chat members: %s", usernames)
+
+        # Check and send pending messages for new members
+        if self.pending_index.stale():
+            self.pending_index.load(dynamodb.Table(self.pending_messages_table_name))
+        for new_member_username in usernames:
+            self.check_and_send_pending_messages(new_member_username)
+
+    def save_chat_members(self, members):
+        """Save chat members to DynamoDB."""
+        chat_members_table = dynamodb.Table('ChatRoomMembers')
+        try:
+            chat_members_table.put_item(
+                Item={
+                    'room': self.name,
+                    'members': list(members)
+                }
+            )
+            self.saved_members = members
+            logger.debug("Saved chat members to DynamoDB: %s", members)
+        except Exception as e:
+            print(f"Error saving chat members to DynamoDB: {e}")
+
+    def get_chat_members(self):
+        """Retrieve chat members from DynamoDB."""
+        chat_members_table = dynamodb.Table('ChatRoomMembers')
+        try:
+            response = chat_members_table.get_item(Key={'room': self.name})
+            members = response.get('Item', {}).get('members', [])
+            logger.debug("Retrieved chat members from DynamoDB: %s", members)
+            return members
+        except Exception as e:
+            print(f"Error retrieving chat members from DynamoDB: {e}")
+            return []
+
+    def send_enter_keystroke(self):
+        """Send an <ENTER> keystroke to get the list of current chat members."""
+        if self.connected and self.writer:
+            self.send_raw("\r\n")
+
+    def build_command_registry(self):
+        """Build the command table once; every trigger channel looks commands up here."""
+        router = CommandRouter()
+        router.register("!weather", lambda ctx, args: self.cached_lookup("weather", self.get_weather_response, args))
+        router.register("!yt", lambda ctx, query: self.cached_lookup("yt", self.get_youtube_response, query))
+        router.register("!search", lambda ctx, query: self.cached_lookup("search", self.get_web_search_response, query))
+        router.register("!chat", lambda ctx, query: self.get_chat_reply(ctx, query, direct=ctx.channel == "direct"))
+        router.register("!news", lambda ctx, topic: self.cached_lookup("news", self.get_news_response, topic))
+        router.register("!map", lambda ctx, place: self.cached_lookup("map", self.get_map_response, place))
+        router.register("!pic", lambda ctx, query: self.cached_lookup("pic", self.get_pic_response, query))
+        router.register("!polly", lambda ctx, voice, text: self.get_polly_response(voice, text), nargs=2,
+                        usage="Usage: !polly <voice> <text> - Voices are Ruth, Joanna, Danielle, Matthew, Stephen")
+        router.register("!mp3yt", lambda ctx, url: self.get_ytmp3_response(url))
+        router.register("!help", lambda ctx, _: self.get_help_response(), inline=True)
+        router.register("!seen", lambda ctx, target: self.get_seen_response(target), inline=True)
+        router.register("!greeting", lambda ctx, _: self.toggle_auto_greeting(), inline=True)
+        router.register("!stocks", lambda ctx, symbol: self.cached_lookup("stocks", self.get_stock_price, symbol))
+        router.register("!crypto", lambda ctx, crypto: self.cached_lookup("crypto", self.get_crypto_price, crypto))
+        router.register("!timer", lambda ctx, value, unit: self.handle_timer_command(ctx.sender, value, unit, ctx.reply),
+                        nargs=2, usage="Usage: !timer <value> <minutes or seconds>", inline=True)
+        router.register("!gif", lambda ctx, query: self.cached_lookup("gif", self.get_gif_response, query))
+        router.register("!msg", lambda ctx, recipient, text: self.get_msg_response(recipient, text, ctx.sender),
+                        nargs=2, usage="Usage: !msg <username> <message>")
+        router.register("!doc", lambda ctx, query: self.get_doc_response(query))
+        router.register("!pod", lambda ctx, show, episode: self.cached_lookup("podcast", self.get_podcast_response, show, episode),
+                        nargs=2, quoted=True, usage='Usage: !pod "<show>" "<episode name or number>"')
+        router.register("!said", lambda ctx, target: self.get_said_response(target), inline=True)
+        router.register("!grep", lambda ctx, query: self.get_grep_response(query, ctx))
+        router.register("!trump", lambda ctx, _: self.get_trump_post())
+        router.register("!mail", lambda ctx, recipient, subject, body: self.send_email(recipient, subject, body),
+                        nargs=3, quoted=True, usage='Usage: !mail "recipient@example.com" "Subject" "Body"')
+        router.register("!blaz", lambda ctx, call_letters: self.get_blaz_response(call_letters), inline=True)
+        router.register("!radio", lambda ctx, query: self.get_radio_response(query),
+                        nargs=1, quoted=True, usage='Usage: !radio "search query"', inline=True)
+        router.register("!musk", lambda ctx, _: self.get_musk_post())
+        router.register("!who", lambda ctx, _: self.get_who_response(), inline=True)
+        return router
+
+    def cached_lookup(self, provider, func, *args):
+        """Return func(*args), answering repeats from the response cache for the provider's TTL."""
+        key = normalize_key(provider, *args)
+        hit, response = self.response_cache.get(key)
+        if hit:
+            return response
+        response = func(*args)
+        if self.is_cacheable_response(response):
+            self.response_cache.set(key, response, DEFAULT_CACHE_TTLS.get(provider, 300))
+        return response
+
+    def is_cacheable_response(self, response):
+        """Errors, usage hints and missing-key messages are never cached."""
+        if not response:
+            return False
+        if response.startswith(("Error", "Usage", "Please", "Could not", "Invalid")):
+            return False
+        return "API key" not in response
+
+    def route_command(self, ctx, message, fallback=None):
+        """
+        Look up the command at the start of message and run it.
+        Cheap commands answer inline; the rest go to the worker pool and answer
+        through ctx.reply. Messages without a command go to fallback, if any.
+        Returns True if a command was recognised.
+        """
+        def deliver(response):
+            # Streamed handlers have already replied and return None
+            if response:
+                ctx.reply(response)
+
+        command, rest = self.commands.lookup(message)
+        if command is None:
+            if fallback:
+                self.dispatch_trigger(ctx.sender, fallback, ctx, message, on_result=deliver)
+            return False
+
+        args = command.parse_args(rest)
+        if args is None:
+            ctx.reply(command.usage)
+        elif command.inline:
+            response = command.run(ctx, args)
+            if response:
+                ctx.reply(response)
+        else:
+            self.dispatch_trigger(ctx.sender, command.run, ctx, args, on_result=deliver)
+        return True
+
+    def handle_private_trigger(self, username, message):
+        """
+        Handle private message triggers and respond privately.
+        Whispers without a known command are treated as !chat.
+        """
+        ctx = TriggerContext(username, "whisper", lambda text: self.send_private_message(username, text))
+        self.route_command(ctx, message, fallback=self.get_whisper_chat_response)
+
+    def get_whisper_chat_response(self, ctx, message):
+        """Answer a whisper that has no command with ChatGPT."""
+        return self.get_chat_reply(ctx, message)
+
+    def get_chat_reply(self, ctx, message, direct=False):
+        """
+        ChatGPT reply for a trigger. When streaming is on, each chunk goes out
+        through ctx.reply as soon as it is complete and None is returned.
+        """
+        on_chunk = ctx.reply if DEFAULT_CHATGPT_STREAMING else None
+        return self.get_chatgpt_response(message, direct=direct, username=ctx.sender, on_chunk=on_chunk)
+
+    def handle_page_trigger(self, username, module_or_channel, message):
+        """
+        Handle page message triggers and respond accordingly.
+        """
+        ctx = TriggerContext(
+            username, "page",
+            lambda text: self.send_page_response(username, module_or_channel, text),
+            module_or_channel=module_or_channel
+        )
+        self.route_command(ctx, message)
+
+    def handle_direct_message(self, username, message):
+        """
+        Handle direct messages and interpret them as !chat queries.
+        """
+        ctx = TriggerContext(username, "direct", lambda text: self.send_direct_message(username, text))
+        if "who's here" in message.lower() or "who is here" in message.lower():
+            message = "who else is in the chat room?"
+        self.route_command(ctx, message, fallback=self.get_direct_chat_response)
+
+    def get_direct_chat_response(self, ctx, message):
+        """Answer a direct message with ChatGPT using a fresh member list."""
+        snapshot = self.refresh_membership()
+        logger.debug("Chat members before generating response: %s", snapshot.members)
+
+        return self.get_chat_reply(ctx, message, direct=True)
+
+    def send_direct_message(self, username, message):
+        """
+        Send a direct message to the specified user.
+        """
+        lines = [f">{username} {chunk}" for chunk in self.chunk_message(message, 250)]
+        for full_message in lines:
+            self.append_terminal_text(full_message + "\n", "normal")
+        self.send_lines(lines, "user:" + username.lower())
+
+    def get_weather_response(self, args):
+        """Fetch weather info and return the response as a string."""
+        key = self.weather_api_key.get()
+        if not key:
+            return "Weather API key is missing."
+
+        # Split args into command, city, and state
+        parts = args.strip().split(maxsplit=3)
+        if len(parts) < 3:
+            return "Usage: !weather <current/forecast> <city> <state>"
+
+        command, city, state = parts[0], parts[1], parts[2]
+
+        if command.lower() not in ['current', 'forecast']:
+            return "Please specify either 'current' or 'forecast' as the first argument."
+
+        if not city or not state:
+            return "Please specify both city and state."
+
+        location = f"{city},{state}"
+
+        if command.lower() == 'current':
+            # Get current weather
+            url = "http://api.openweathermap.org/data/2.5/weather"
+            params = {
+                "q": location,
+                "appid": key,
+                "units": "imperial"
+            }
+            try:
+                r = self.http.get(url, params=params)
+                r.raise_for_status()
+                data = r.json()
+                if data.get("cod") != 200:
+                    return f"Could not get weather for '{location}'."
+                
+                desc = data["weather"][0]["description"]
+                temp_f = data["main"]["temp"]
+                feels_like = data["main"]["feels_like"]
+                humidity = data["main"]["humidity"]
+                wind_speed = data["wind"]["speed"]
+                precipitation = data.get("rain", {}).get("1h", 0) + data.get("snow", {}).get("1h", 0)
+
+                return (
+                    f"Current weather in {city.title()}, {state.upper()}: {desc}, {temp_f:.1f}°F "
+                    f"(feels like {feels_like:.1f}°F), Humidity {humidity}%, Wind {wind_speed} mph, "
+                    f"Precipitation {precipitation} mm."
+                )
+            except requests.exceptions.RequestException as e:
+                return f"Error fetching weather: {str(e)}"
+
+        else:  # forecast
+            # Get 5-day forecast
+            url = "http://api.openweathermap.org/data/2.5/forecast"
+            params = {
+                "q": location,
+                "appid": key,
+                "units": "imperial"
+            }
+            try:
+                r = self.http.get(url, params=params)
+                r.raise_for_status()
+                data = r.json()
+                if data.get("cod") != "200":
+                    return f"Could not get forecast for '{location}'."
+
+                # Get next 3 days forecast (excluding today)
+                forecasts = []
+                current_date = None
+                for item in data['list']:
+                    date = time.strftime('%Y-%m-%d', time.localtime(item['dt']))
+                    if date == time.strftime('%Y-%m-%d'):  # Skip today
+                        continue
+                    if date != current_date and len(forecasts) < 3:  # Get next 3 days
+                        current_date = date
+                        temp = item['main']['temp']
+                        desc = item['weather'][0]['description']
+                        forecasts.append(f"{time.strftime('%A', time.localtime(item['dt']))}: {desc}, {temp:.1f}°F")
+
+                return (
+                    f"3-day forecast for {city.title()}, {state.upper()}: " + 
+                    ", ".join(forecasts)
+                )
+            except requests.exceptions.RequestException as e:
+                return f"Error fetching weather: {str(e)}"
+
+    def get_youtube_response(self, query):
+        """Perform a YouTube search and return the response as a string."""
+        key = self.youtube_api_key.get()
+        if not key:
+            return "YouTube API key is missing."
+        else:
+            url = "https://www.googleapis.com/youtube/v3/search"
+            params = {
+                "part": "snippet",
+                "q": query,
+                "key": key,
+                "maxResults": 1
+            }
+            try:
+                r = self.http.get(url, params=params)
+                data = r.json()
+                items = data.get("items", [])
+                if not items:
+                    return f"No YouTube results found for '{query}'."
+                else:
+                    video_id = items[0]["id"].get("videoId")
+                    title = items[0]["snippet"]["title"]
+                    url_link = f"https://www.youtube.com/watch?v={video_id}"
+                    return f"Top YouTube result: {title}\n{url_link}"
+            except Exception as e:
+                return f"Error fetching YouTube results: {str(e)}"
+
+    def get_web_search_response(self, query):
+        """Perform a Google Custom Search and return the response as a string."""
+        cse_key = self.google_cse_api_key.get()
+        cse_id = self.google_cse_cx.get()
+        if not cse_key or not cse_id:
+            return "Google CSE API key or engine ID is missing."
+        else:
+            url = "https://www.googleapis.com/customsearch/v1"
+            params = {
+                "key": cse_key,
+                "cx": cse_id,
+                "q": query,
+                "num": 1  # just one top result
+            }
+            try:
+                r = self.http.get(url, params=params)
+                data = r.json()
+                items = data.get("items", [])
+                if not items:
+                    return f"No Google search results found for '{query}'."
+                else:
+                    top = items[0]
+                    title = top.get("title", "No Title")
+                    snippet = top.get("snippet", "")
+                    link = top.get("link", "No Link")
+
+                    return (
+                        f"Top Google result for '{query}':\n"
+                        f"Title: {title}\n"
+                        f"Snippet: {snippet}\n"
+                        f"Link: {link}"
+                    )
+            except Exception as e:
+                return f"Error with Google search: {str(e)}"
+
+    def get_chatgpt_response(self, user_text, direct=False, username=None, on_chunk=None):
+        """
+        Send user_text to ChatGPT and return the response as a string.
+        With on_chunk, the reply is streamed: each 250-character chunk is passed
+        to on_chunk as soon as it is complete and None is returned.
+        """
+        if not openai.api_key:
+            return "OpenAI API key is not set."
+
+        # self.chat_members is the room snapshot, kept current from joins, leaves and who-lists
+        members = list(self.chat_members)
+        logger.debug("Members list used for ChatGPT response: %s", members)
+
+        # Turn user@domain into just the username portion if you want:
+        chatroom_usernames = []
+        for member in members:
+            name_part = member.split('@')[0]
+            chatroom_usernames.append(name_part)
+
+        # Create a simple comma-separated string for the system prompt
+        chatroom_members_str = ", ".join(chatroom_usernames)
+        logger.debug("Chatroom members string for ChatGPT: %s", chatroom_members_str)
+
+        system_message = (
+            "Your name is Ultron. You speak very casually. When you greet people, you usually say things like 'Hey :)', 'What's up?', 'How's it going?'. "
+            "You are just a laidback guy, hanging out in the bbs chatroom. "
+            "Respond concisely in 220-characters or less but don't exceed 250 total characters in your responses. "
+            "If asked about who's in the room, reference the current chatroom members list. "
+            "You are speaking in a BBS plain text chatroom, please make sure any emoji you use are plain text, and that the format of your responses is ideal for plain text. "
+            f"The current chatroom members are: {chatroom_members_str}."
+        )
+
+        if direct:
+            system_message = (
+                "Your name is Ultron. You speak very casually. When you greet people, you usually say things like 'Hey :)', 'What's up?', 'How's it going?'. "
+                "You are just a laidback guy, hanging out in the bbs chatroom. "
+                "Respond concisely in 220-characters or less but don't exceed 250 total characters in your responses. "
+                "If asked about who's in the room, reference the current chatroom members list. "
+                "You are speaking in a BBS plain text chatroom, please make sure any emoji you use are plain text, and that the format of your responses is ideal for plain text. "
+                f"The current chatroom members are: {chatroom_members_str}."
+            )
+
+        # Recent conversation history, loaded from DynamoDB only on first use
+        truncated_history = self.conversations.recent(username or "public_chat")
+
+        messages = [
+            {"role": "system", "content": system_message}
+        ]
+        # Then append user messages and assistant replies from the truncated history
+        for item in truncated_history:
+            messages.append({"role": "user", "content": item['message']})
+            messages.append({"role": "assistant", "content": item['response']})
+
+        # (Optional) add a mini fact about who is speaking:
+        if username:
+            messages.append({"role": "system", "content": f"Reminder: The user speaking is named {username}."})
+
+        # Finally append this new user_text
+        messages.append({"role": "user", "content": user_text})
+
+        logger.debug("Chunks sent to ChatGPT: %s", messages)
+
+        try:
+            if on_chunk:
+                chunker = StreamChunker(self.stream_chunk_size())
+
+                def on_text(text):
+                    for chunk in chunker.feed(text):
+                        on_chunk(chunk)
+
+                gpt_response = self.stream_chat_completion(messages, on_text, max_tokens=500)
+                for chunk in chunker.finish():
+                    on_chunk(chunk)
+            else:
+                completion = openai.ChatCompletion.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    max_tokens=500,
+                    temperature=0.2,
+                    n=1
+                )
+                gpt_response = completion.choices[0].message['content']
+
+            if username:
+                self.save_conversation(username, user_text, gpt_response)
+            else:
+                self.save_conversation("public_chat", user_text, gpt_response)
+
+        except Exception as e:
+            gpt_response = f"Error with ChatGPT API: {str(e)}"
+            if on_chunk:
+                on_chunk(gpt_response)
+
+        logger.debug("ChatGPT response: %s", gpt_response)
+        return None if on_chunk else gpt_response
+
+    def stream_chat_completion(self, messages, on_text, max_tokens):
+        """Run a streaming ChatGPT completion, passing each text delta to on_text. Returns the full text."""
+        completion = openai.ChatCompletion.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=0.2,
+            n=1,
+            stream=True
+        )
+        parts = []
+        for event in completion:
+            text = event.choices[0].delta.get('content')
+            if text:
+                parts.append(text)
+                on_text(text)
+        return "".join(parts)
+
+    def stream_chunk_size(self):
+        """Chunk size for streamed replies, leaving room for the MUD-mode prefix send_full_message adds."""
+        return 250 - len("Gos ") if self.mud_mode.get() else 250
+
+    def get_map_response(self, place):
+        """Fetch place info from Google Places API and return the response as a string."""
+        key = self.google_places_api_key.get()
+        if not key:
+            return "Google Places API key is missing."
+        elif not place:
+            return "Please specify a place."
+        else:
+            url = "https://places.googleapis.com/v1/places:searchText"
+            headers = {
+                "Content-Type": "application/json",
+                "X-Goog-Api-Key": key,
+                "X-Goog-FieldMask": "places.displayName,places.formattedAddress,places.types,places.websiteUri"
+            }
+            data = {
+                "textQuery": place
+            }
+            try:
+                r = self.http.post(url, json=data, headers=headers)
+                r.raise_for_status()  # Raise an HTTPError for bad responses
+                data = r.json()
+                places = data.get("places", [])
+                if not places:
+                    return f"Could not find place '{place}'."
+                else:
+                    place_info = places[0]
+                    name = place_info.get("displayName", {}).get("text", "No Name")
+                    address = place_info.get("formattedAddress", "No Address")
+                    types = ", ".join(place_info.get("types", []))
+                    website = place_info.get("websiteUri", "No Website")
+                    return (
+                        f"Place: {name}\n"
+                        f"Address: {address}\n"
+                        f"Types: {types}\n"
+                        f"Website: {website}"
+                    )
+            except requests.exceptions.RequestException as e:
+                return f"Error fetching place info: {str(e)}"
+
+    def get_help_response(self):
+        """Return the help message as a string."""
+        return (
+            "Available commands: Please use a ! immediately followed by one of the following keywords (no space): "
+            "weather <location>, yt <query>, search <query>, chat <message>, news <topic>, map <place>, pic <query>, "
+            "polly <voice> <text>, mp3yt <youtube link>, help, seen <username ...|prefix*>, said [<username>] [<count>|<span>], grep <terms> [@username], greeting, stocks <symbol>, "
+            "crypto <symbol>, timer <value> <minutes or seconds>, gif <query>, msg <username> <message>, doc <query>, pod <show> <episode>, !trump, nospam.\n"
+        )
+
+    def send_raw(self, text):
+        """Queue text for the BBS as-is; safe to call from any thread and never blocks."""
+        self.outbound.put(text, target="raw", block=False)
+
+    def send_lines(self, lines, target):
+        """
+        Queue chat lines for the BBS, in order for target.
+
+        Blocks a worker thread while the outbound queue is full, so a burst of
+        long replies slows the handlers down instead of piling up.
+        """
+        self.outbound.put([line + "\r\n" for line in lines], target=target)
+
+    def send_full_message(self, message):
+        """
+        Send a full message to the terminal display and the BBS server.
+        """
+        if message is None:
+            return  # Avoid sending if the message is None
+
+        prefix = "Gos " if self.mud_mode.get() else ""
+        lines = message.split('\n')
+        full_message = '\n'.join([prefix + line for line in lines])
+        chunks = self.chunk_message(full_message, 250)  # Use the new chunk_message!
+
+        for chunk in chunks:
+            self.append_terminal_text(chunk + "\n", "normal")
+        if self.connected and self.writer:
+            self.send_lines(chunks, "public")  # Paced by the outbound queue
+            logger.debug("Queued for BBS: %s", chunks)
+
+    def chunk_message(self, message, chunk_size):
+        """
+        Break a message into chunks, up to `chunk_size` characters each,
+        ensuring no splits in the middle of words or lines.
+        """
+        return chunk_message(message, chunk_size)
+
+    def load_favorites(self):
+        """Load favorite BBS addresses from a file."""
+        if os.path.exists("favorites.json"):
+            with open("favorites.json", "r") as file:
+                return json.load(file)
+        return []
+
+    def save_favorites(self):
+        """Save favorite BBS addresses to a file."""
+        with open("favorites.json", "w") as file:
+            json.dump(self.favorites, file)
+
+    def load_nickname(self):
+        """Load nickname from a file."""
+        if os.path.exists("nickname.json"):
+            with open("nickname.json", "r") as file:
+                return json.load(file)
+        return ""
+
+    def save_nickname(self):
+        """Save nickname to a file."""
+        with open("nickname.json", "w") as file:
+            json.dump(self.nickname.get(), file)
+
+    def send_username(self):
+        """Send the username to the BBS."""
+        if self.connected and self.writer:
+            username = self.username.get()
+            self.send_raw(username + "\r\n")  # Append carriage return and newline
+            if self.remember_username.get():
+                self.save_username()
+
+    def send_password(self):
+        """Send the password to the BBS."""
+        if self.connected and self.writer:
+            password = self.password.get()
+            self.send_raw(password + "\r\n")  # Append carriage return and newline
+            if self.remember_password.get():
+                self.save_password()
+
+    def load_username(self):
+        """Load username from a file."""
+        if os.path.exists("username.json"):
+            with open("username.json", "r") as file:
+                return json.load(file)
+        return ""
+
+    def save_username(self):
+        """Save username to a file."""
+        with open("username.json", "w") as file:
+            json.dump(self.username.get(), file)
+
+    def load_password(self):
+        """Load password from a file."""
+        if os.path.exists("password.json"):
+            with open("password.json", "r") as file:
+                return json.load(file)
+        return ""
+
+    def save_password(self):
+        """Save password to a file."""
+        with open("password.json", "w") as file:
+            json.dump(self.password.get(), file)
+
+    ########################################################################
+    #                           Trigger Parsing
+    ########################################################################
+    def parse_incoming_triggers(self, line, classified=None):
+        """Act on a teleconference line; classified is the line's ClassifiedLine if already computed."""
+        if classified is None:
+            classified = classify(line)
+        clean_line = classified.clean
+
+        # Always allow the !nospam command to toggle state
+        if "!nospam" in clean_line:
+            # Toggle and persist the new state
+            self.no_spam_mode.set(not self.no_spam_mode.get())
+            state = "enabled" if self.no_spam_mode.get() else "disabled"
+            self.send_full_message(f"No Spam Mode has been {state}.")
+            self.save_no_spam_state()
+            return
+
+        # If !nospam is ON, only allow whispered and paging messages.
+        if self.no_spam_mode.get() and classified.kind not in ("whisper", "page"):
+            self.append_terminal_text("Ignored trigger due to No Spam Mode.\n", "normal")
+            return
+
+        if classified.kind == "whisper":
+            username, message = classified.fields
+            self.handle_private_trigger(username, message)
+        elif classified.kind == "page":
+            username, module_or_channel, message = classified.fields
+            self.handle_page_trigger(username, module_or_channel, message)
+        elif classified.kind == "direct":
+            # Direct messages are only processed if !nospam is OFF
+            username, message = classified.fields
+            self.handle_direct_message(username, message)
+        elif classified.kind == "public":
+            sender, message = classified.fields
+
+            # Always store the public message.
+            self.store_public_message(sender, message)
+
+            # Ignore messages from Ultron (the bot itself).
+            if sender.lower() == "ultron":
+                return
+
+            # Commands are looked up by their leading token.
+            self.handle_public_trigger(sender, message)
+
+    def send_private_message(self, username, message):
+        """
+        Send a private message to the specified user.
+        """
+        lines = [f"Whisper to {username} {chunk}" for chunk in self.chunk_message(message, 250)]
+        for full_message in lines:
+            self.append_terminal_text(full_message + "\n", "normal")
+        self.send_lines(lines, "user:" + username.lower())
+
+    def get_who_response(self):
+        """Return a list of users currently in the chatroom."""
+        if not self.chat_members:
+            return "No users currently in the chatroom."
+        else:
+            return "Users currently in the chatroom: " + ", ".join(self.chat_members)
+
+    def send_page_response(self, username, module_or_channel, message):
+        """
+        Send a page response to the specified user and module/channel.
+        """
+        lines = [f"/P {username} {chunk}" for chunk in self.chunk_message(message, 250)]
+        for full_message in lines:
+            self.append_terminal_text(full_message + "\n", "normal")
+        self.send_lines(lines, "user:" + username.lower())
+
+    ########################################################################
+    #                           Keep Alive
+    ########################################################################
+    async def keep_alive(self):
+        """
+        Keep an idle connection alive. Nothing is sent until the board's idle
+        period has passed with no traffic either way; then one keep-alive
+        (a telnet NOP or an ENTER, per the board's profile) goes out. Like
+        the silence probe it goes through send_keepalive(), so profiles "nop"
+        and "off" never type ENTER (see bbsbot.keepalive).
+        """
+        while not self.keep_alive_stop_event.is_set():
+            idle = self.keepalive["idle"]
+            wait = idle
+            if self.connected and self.writer and self.keepalive["mode"] != "off":
+                quiet = time.monotonic() - max(self.last_received, self.outbound.last_write, self.last_keepalive)
+                if quiet >= idle:
+                    send_keepalive(self.writer, self.keepalive["mode"], self.send_enter_keystroke)
+                    self.last_keepalive = time.monotonic()
+                else:
+                    wait = idle - quiet
+            await asyncio.sleep(wait)
+
+    def start_keep_alive(self):
+        """Start the keep-alive coroutine, replacing any that is running."""
+        if self.keep_alive_task:
+            self.keep_alive_task.cancel()
+        self.keep_alive_stop_event.clear()
+        self.keep_alive_task = asyncio.run_coroutine_threadsafe(self.keep_alive(), self.loop)
+
+    def stop_keep_alive(self):
+        """Stop the keep-alive coroutine."""
+        self.keep_alive_stop_event.set()
+        if self.keep_alive_task:
+            self.keep_alive_task.cancel()
+
+    def handle_user_greeting(self, username):
+        """
+        Handle user-specific greeting when they enter the chatroom.
+        The join line has already added them to the room, and the caller only
+        dispatches this for users who weren't listed before.
+        """
+        if not self.auto_greeting_enabled:
+            return
+
+        new_member_username = username.split('@')[0]  # Remove the @<bbsaddress> part
+        greeting_message = f"{new_member_username} just came into the chatroom, give them a casual greeting directed at them."
+        response = self.get_chatgpt_response(greeting_message, direct=True, username=new_member_username)
+        self.send_direct_message(new_member_username, response)
+
+    def refresh_membership(self):
+        """
+        Return the current room snapshot without waiting on the BBS.
+
+        Joins and leaves keep the snapshot current; a who-list is requested
+        (ENTER) in the background when the last one is older than
+        membership_max_age. Only before a session's first who-list does the
+        caller wait for it, briefly.
+        """
+        snapshot = self.room.snapshot
+        if time.time() - snapshot.synced_at > DEFAULT_MEMBERSHIP_MAX_AGE:
+            requested = time.time()
+            self.send_enter_keystroke()
+            if not snapshot.synced_at:
+                snapshot = self.room.wait_for_sync(requested, FIRST_WHO_LIST_WAIT)
+        return snapshot
+
+    def get_news_response(self, topic):
+        """Fetch top 2 news headlines and return the response as a string."""
+        key = self.news_api_key.get()
+        if not key:
+            return "News API key is missing."
+        else:
+            url = "https://newsapi.org/v2/everything"  # Using "everything" endpoint for broader topic search
+            params = {
+                "q": topic,  # The keyword/topic to search for
+                "apiKey": key,
+                "language": "en",
+                "pageSize": 2  # Fetch top 2 headlines
+            }
+            try:
+                r = self.http.get(url, params=params)
+                data = r.json()
+                articles = data.get("articles", [])
+                if not articles:
+                    return f"No news articles found for '{topic}'."
+                else:
+                    response = ""
+                    for i, article in enumerate(articles):
+                        title = article.get("title", "No Title")
+                        description = article.get("description", "No Description")
+                        link = article.get("url", "No URL")
+                        response += f"{i + 1}. {title}\n   {description[:230]}...\n"
+                        response += f"Link: {link}\n\n"
+                    return response.strip()
+            except Exception as e:
+                return f"Error fetching news: {str(e)}"
+
+    def get_polly_response(self, voice, text):
+        """Convert text to speech using AWS Polly and return an S3 link to the MP3 file."""
+        valid_voices = {
+            "Matthew": "standard",
+            "Stephen": "neural",
+            "Ruth": "neural",
+            "Joanna": "neural",
+            "Danielle": "neural"
+        }
+        if voice not in valid_voices:
+            return f"Invalid voice. Please choose from: {', '.join(valid_voices.keys())}."
+
+        if len(text) > 200:
+            return "Error: The text for Polly must be 200 characters or fewer."
+
+        polly_client = boto3.client('polly', region_name='us-east-1')
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        bucket_name = 'bbs-audio-files'
+        object_key = f"polly_output_{int(time.time())}.mp3"
+
+        try:
+            response = polly_client.synthesize_speech(
+                Text=text,
+                OutputFormat='mp3',
+                VoiceId=voice,
+                Engine=valid_voices[voice]
+            )
+            audio_stream = response['AudioStream'].read()
+
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=object_key,
+                Body=audio_stream,
+                ContentType='audio/mpeg'
+            )
+
+            s3_url = f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
+            response_message = f"Here is your Polly audio: {s3_url}"
+        except Exception as e:
+            response_message = f"Error with Polly: {str(e)}"
+
+        return response_message
+
+    def get_ytmp3_response(self, url):
+        """Download YouTube video as MP3, upload to S3, and return the link."""
+        try:
+            # Use yt-dlp to download and convert the YouTube video to MP3
+            result = subprocess.run(
+                ["yt-dlp", "-x", "--audio-format", "mp3", url, "-o", "/tmp/%(id)s.%(ext)s"],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                raise Exception(result.stderr)
+
+            # Extract the video ID from the URL
+            video_id = url.split("v=")[1].split("&")[0]
+            mp3_filename = f"/tmp/{video_id}.mp3"
+
+            s3_client = boto3.client('s3', region_name='us-east-1')
+            bucket_name = 'bbs-audio-files'
+            object_key = f"ytmp3_{video_id}.mp3"
+
+            with open(mp3_filename, 'rb') as mp3_file:
+                s3_client.put_object(
+                    Bucket=bucket_name,
+                    Key=object_key,
+                    Body=mp3_file,
+                    ContentType='audio/mpeg'
+                )
+
+            s3_url = f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
+            response_message = f"Here is your MP3: {s3_url}"
+        except Exception as e:
+            response_message = f"Error processing YouTube link: {str(e)}"
+
+        return response_message
+
+    def toggle_auto_greeting(self):
+        """Toggle the auto-greeting feature on and off and return the new state."""
+        self.auto_greeting_enabled = not self.auto_greeting_enabled
+        state = "enabled" if self.auto_greeting_enabled else "disabled"
+        return f"Auto-greeting has been {state}."
+
+    def get_seen_response(self, target):
+        """
+        Last-seen times for one or more space-separated names. "dra*" lists the
+        most recently seen handles starting with "dra"; a name that was never
+        seen gets close spellings suggested.
+        """
+        names = target.split()
+        if not names:
+            return "Usage: !seen <username> [more usernames], or !seen <prefix>*"
+        return "\n".join(self.describe_seen(name) for name in names[:SEEN_MAX_NAMES])
+
+    def describe_seen(self, username):
+        """One line of a !seen answer."""
+        if username.endswith("*"):
+            prefix = normalize_name(username.rstrip("*"))
+            matches = self.last_seen.matching(prefix) if prefix else []
+            if not matches:
+                return f"Nobody matching {username} has been seen in the chatroom."
+            now = time.time()
+            return f"Seen matching {username}: " + ", ".join(
+                f"{name} ({format_age(now - when)})" for name, when in matches
+            )
+
+        last_seen_time = self.last_seen.get(username)
+        if last_seen_time is not None:
+            last_seen_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last_seen_time))
+            time_diff = int(time.time()) - last_seen_time
+            hours, remainder = divmod(time_diff, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            return f"{username} was last seen on {last_seen_str} ({hours} hours, {minutes} minutes, {seconds} seconds ago)."
+
+        key = normalize_name(username)
+        suggestions = self.last_seen.similar(key) if key else []
+        if suggestions:
+            return f"{username} has not been seen in the chatroom. Did you mean {', '.join(name for name, _ in suggestions)}?"
+        return f"{username} has not been seen in the chatroom."
+
+    def get_stock_price(self, symbol):
+        """Fetch the current price of a stock."""
+        api_key = self.alpha_vantage_api_key.get()
+        url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={api_key}"
+        try:
+            response = self.http.get(url)
+            data = response.json()
+            price = data["Global Quote"]["05. price"]
+            return f"{symbol.upper()}: ${price}"
+        except Exception as e:
+            return f"Error fetching stock price: {str(e)}"
+
+    def get_crypto_price(self, crypto):
+        """Fetch the current price of a cryptocurrency."""
+        api_key = self.coinmarketcap_api_key.get()
+        url = 'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest'
+        parameters = {
+            'symbol': crypto,
+            'convert': 'USD'
+        }
+        headers = {
+            'Accepts': 'application/json',
+            'X-CMC_PRO_API_KEY': api_key,
+        }
+        try:
+            response = self.http.get(url, params=parameters, headers=headers)
+            data = response.json()
+            if "data" in data and crypto in data["data"]:
+                price = data["data"][crypto]["quote"]["USD"]["price"]
+                return f"{crypto.upper()}: ${price:.2f}"
+            else:
+                return f"Invalid cryptocurrency symbol '{crypto}'. Please use valid symbols like BTC, ETH, DOGE, etc."
+        except (requests.ConnectionError, requests.Timeout, requests.TooManyRedirects) as e:
+            return f"Error fetching crypto price: {str(e)}"
+
+    def handle_cleanup_maintenance(self):
+        """
+        Cleanup maintenance is coming: drop the connection and let the
+        supervisor reconnect (and log on again) once the board is back.
+        """
+        if self.logon_automation_enabled.get():
+            print("Cleanup maintenance detected. Reconnecting to the BBS...")
+            self.backoff.reset()
+            self.close_connection()
+
+    def handle_timer_command(self, username, value, unit, reply):
+        """Handle the !timer command to set a timer for the user; reply announces when it ends."""
+        try:
+            value = int(value)
+            if unit not in ["minutes", "seconds"]:
+                raise ValueError("Invalid unit")
+        except ValueError:
+            return "Invalid timer value or unit. Please use the syntax '!timer <value> <minutes or seconds>'."
+
+        duration = value * 60 if unit == "minutes" else value
+        timer_id = f"{username}_{time.time()}"
+
+        def timer_callback():
+            reply(f"Timer for {username} has ended.")
+            del self.timers[timer_id]
+
+        def schedule_timer():
+            self.timers[timer_id] = self.loop.call_later(duration, timer_callback)
+
+        self.loop.call_soon_threadsafe(schedule_timer)
+        return f"Timer set for {username} for {value} {unit}."
+
+    def get_gif_response(self, query):
+        """Fetch a popular GIF based on the query and return the direct link to the GIF."""
+        key = self.giphy_api_key.get()
+        if not key:
+            return "Giphy API key is missing."
+        elif not query:
+            return "Please specify a query."
+        else:
+            url = "https://api.giphy.com/v1/gifs/search"
+            params = {
+                "api_key": key,
+                "q": query,
+                "limit": 1,
+                "rating": "g"
+            }
+            try:
+                r = self.http.get(url, params=params)
+                data = r.json()
+                if not data['data']:
+                    return "No GIFs found for the query."
+                else:
+                    gif_page_url = data['data'][0]['url']
+                    # Fetch the HTML content of the Giphy page
+                    page_response = self.http.get(gif_page_url)
+                    soup = BeautifulSoup(page_response.content, 'html.parser')
+                    # Extract the direct link to the GIF
+                    meta_tag = soup.find('meta', property='og:image')
+                    if meta_tag:
+                        direct_gif_url = meta_tag['content']
+                        # Ensure the link ends with .gif
+                        if direct_gif_url.endswith('.webp'):
+                            direct_gif_url = direct_gif_url.replace('.webp', '.gif')
+                        return direct_gif_url
+                    else:
+                        return "Could not extract the direct GIF link."
+            except requests.exceptions.RequestException as e:
+                return f"Error fetching GIF: {str(e)}"
+
+    def get_msg_response(self, recipient, message, sender):
+        """Handle the !msg command to leave a message for another user."""
+        self.save_pending_message(recipient, sender, message)
+        return f"Message for {recipient} saved. They will receive it the next time they are seen in the chatroom."
+
+    def check_and_send_pending_messages(self, username):
+        """Check for and send any pending messages for the given username."""
+        if not self.pending_index.might_have(username):
+            return
+        # Dropped before the query, so a message saved meanwhile puts the name back
+        self.pending_index.discard(username)
+        try:
+            pending_messages = self.get_pending_messages(username)
+        except Exception:
+            self.pending_index.add(username)
+            raise
+        for msg in pending_messages:
+            sender = msg['sender']
+            message = msg['message']
+            self.send_direct_message(username, f"Message from {sender}: {message}")
+        if pending_messages:
+            self.delete_pending_messages(username, [msg['timestamp'] for msg in pending_messages])
+
+    def load_no_spam_state(self):
+        if os.path.exists("nospam_state.json"):
+            with open("nospam_state.json", "r") as file:
+                data = json.load(file)
+                return data.get("nospam", False)
+        return False
+
+    def save_no_spam_state(self):
+        with open("nospam_state.json", "w") as file:
+            json.dump({"nospam": self.no_spam_mode.get()}, file)
+
+    def get_doc_response(self, query):
+        """Handle the !doc command to create a document using ChatGPT and return an S3 link to the file."""
+        if not query:
+            return "Please provide a query for the document."
+
+        # Prepare the prompt for ChatGPT
+        prompt = f"Please write a detailed, verbose document based on the following query: {query}"
+
+        try:
+            # Stream the response from ChatGPT straight into a .txt file
+            filename = f"document_{int(time.time())}.txt"
+            with open(filename, 'w') as file:
+                self.get_chatgpt_document_response(prompt, on_text=file.write)
+
+            # Upload the file to S3
+            s3_client = boto3.client('s3', region_name='us-east-1')
+            bucket_name = 'bot-files-repo'
+            object_key = filename
+
+            with open(filename, 'rb') as file:
+                s3_client.put_object(
+                    Bucket=bucket_name,
+                    Key=object_key,
+                    Body=file,
+                    ContentType='text/plain'
+                )
+
+            # Generate the S3 URL
+            s3_url = f"https://{bucket_name}.s3.amazonaws.com/{object_key}"
+            response_message = f"Here is your document: {s3_url}"
+
+            # Delete the local file after uploading
+            os.remove(filename)
+
+        except Exception as e:
+            response_message = f"Error creating document: {str(e)}"
+
+        return response_message
+
+    def get_chatgpt_document_response(self, prompt, on_text=None):
+        """
+        Send a prompt to ChatGPT and return the full response as a string.
+        With on_text, the response is streamed and each piece is passed to on_text as it arrives.
+        """
+        if not openai.api_key:
+            gpt_response = "OpenAI API key is not set."
+            if on_text:
+                on_text(gpt_response)
+            return gpt_response
+
+        messages = [
+            {"role": "system", "content": "You are a writer of detailed, verbose documents."},
+            {"role": "user", "content": prompt}
+        ]
+
+        if on_text:
+            try:
+                return self.stream_chat_completion(messages, on_text, max_tokens=10000)
+            except Exception as e:
+                gpt_response = f"Error with ChatGPT API: {str(e)}"
+                on_text(gpt_response)
+                return gpt_response
+
+        try:
+            completion = openai.ChatCompletion.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                max_tokens=10000,
+                temperature=0.2,
+                n=1
+            )
+            gpt_response = completion.choices[0].message['content']
+        except Exception as e:
+            gpt_response = f"Error with ChatGPT API: {str(e)}"
+
+        return gpt_response
+
+    def store_public_message(self, username, message):
+        """Add the public message to the history, one entry per line."""
+        now = time.time()
+        for line in message.split('\n'):
+            self.public_history.add(username.lower(), line, now)
+
+    def get_said_response(self, target):
+        """
+        Handle the !said command: the last three public lines in the room, or
+        of one user. A number asks for that many lines (up to SAID_MAX_LINES)
+        and a span such as 10m, 2h or 1d for the lines said within it.
+        """
+        username = None
+        count = 3
+        since = None
+        for part in target.split():
+            span = parse_span(part)
+            if span is not None:
+                since = time.time() - span
+                count = SAID_MAX_LINES
+            elif part.isdigit():
+                count = min(max(int(part), 1), SAID_MAX_LINES)
+            elif username is None:
+                username = part.lower()
+            else:
+                return "Usage: !said [<username>] [<count>|<span like 10m, 2h, 1d>]"
+        messages = self.public_history.recent(count, username, since)
+        if username:
+            if not messages:
+                return f"No public messages found for {username}."
+            return f"Last {len(messages)} public messages from {username}: " + " ".join(m.text for m in messages)
+        if not messages:
+            return "No public messages found."
+        return f"Last {len(messages)} public messages in the chatroom: " + " | ".join(
+            f"{m.username}: {m.text}" for m in messages
+        )
+
+    def search_transcript(self, query, username=None, viewer=None):
+        """This session's transcript lines matching query, newest first; see TranscriptIndex.search."""
+        return self.transcript.search(query, room=self.name, username=username, viewer=viewer, limit=GREP_MAX_RESULTS)
+
+    def get_grep_response(self, query, ctx):
+        """
+        Handle the !grep command: the newest lines containing every search term.
+        A last word of "@bob", or the name of anyone who has been seen, limits
+        the search to that user. Whispers and pages are only ever searched for
+        the person who sent them, and only when asked in private.
+        """
+        words = query.split()
+        username = None
+        if words and words[-1].startswith("@") and len(words[-1]) > 1:
+            username = words.pop()[1:]
+        elif len(words) > 1 and self.last_seen.get(words[-1]) is not None:
+            username = words.pop()
+        if not words:
+            return "Usage: !grep <terms> [@username]"
+        viewer = ctx.sender if ctx.channel in ("whisper", "page") else ""
+        lines = self.search_transcript(" ".join(words), username=username, viewer=viewer)
+        if not lines:
+            about = f" from {username}" if username else ""
+            return f"Nothing{about} matching {' '.join(words)} found."
+        now = time.time()
+        return "\n".join(
+            f"[{format_age(now - line.time)}] {line.username}: {line.text}" for line in lines
+        )
+
+    def handle_public_trigger(self, username, message):
+        """
+        Handle public message triggers and respond accordingly.
+        """
+        ctx = TriggerContext(username, "public", self.send_full_message)
+        self.route_command(ctx, message)
+
+    def get_podcast_response(self, show, episode):
+        """Query the iTunes API for podcast episode details."""
+        url = "https://itunes.apple.com/search"
+        # Build parameters with a cache-buster parameter
+        params = {
+            "term": f"{show} {episode}",
+            "media": "podcast",
+            "entity": "podcastEpisode",
+            "limit": 10,  # Increase limit to 10 results
+            "cb": int(time.time())  # Cache buster to force a fresh request
+        }
+        try:
+            # Add header to prevent caching
+            r = self.http.get(url, params=params, headers={"Cache-Control": "no-cache"})
+            data = r.json()
+            if data["resultCount"] == 0:
+                # Retry with just the show name if no results found
+                params["term"] = show
+                params["cb"] = int(time.time())  # Update cache buster
+                r = self.http.get(url, params=params, headers={"Cache-Control": "no-cache"})
+                data = r.json()
+                if data["resultCount"] == 0:
+                    return f"No matching episode found for {show} {episode}."
+
+            results = data["results"]
+            best_match = None
+
+            # Check if the episode argument is numeric and adjust matching accordingly.
+            is_numeric_episode = episode.isdigit()
+
+            for result in results:
+                title = result.get("trackName", "").lower()
+                description = result.get("description", "").lower()
+                if is_numeric_episode:
+                    if f"episode {episode}" in title or f"episode {episode}" in description:
+                        best_match = result
+                        break
+                else:
+                    if episode.lower() in title or episode.lower() in description:
+                        best_match = result
+                        break
+
+            if not best_match:
+                return f"No matching episode found for {show} {episode}."
+
+            title = best_match.get("trackName", "N/A")
+            release_date = best_match.get("releaseDate", "N/A")
+            preview_url = best_match.get("previewUrl", "N/A")
+            return f"Title: {title}\nRelease Date: {release_date}\nPreview: {preview_url}"
+        except Exception as e:
+            return f"Error fetching podcast details: {str(e)}"
+
+    def get_trump_post(self):
+        """Run the Trump post scraper script and return the latest post."""
+        try:
+            command = [
+                sys.executable,
+                r"C:\Users\Noah\OneDrive\Documents\bbschatbot1.0\TrumpsLatestPostScraper.py"
+            ]
+            result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', errors='ignore', timeout=180)
+            output = result.stdout.strip()
+
+            if result.returncode != 0:
+                # If the script returned a non-zero exit code
+                error_msg = result.stderr.strip() or "Unknown error from Trump scraper."
+                return f"Error from Trump post script: {error_msg}"
+
+            # Split the output into lines and get the last two lines
+            lines = output.splitlines()
+            if len(lines) >= 2:
+                return "\n".join(lines[-2:])
+            else:
+                return output
+        except Exception as e:
+            return f"Error running Trump post script: {str(e)}"
+
+    def load_email_credentials(self):
+        """Load email credentials from a file."""
+        if os.path.exists("email_credentials.json"):
+            with open("email_credentials.json", "r") as file:
+                return json.load(file)
+        return {}
+
+    def send_email(self, recipient, subject, body):
+        """Send an email using Gmail."""
+        credentials = self.load_email_credentials()
+        smtp_server = credentials.get("smtp_server", "smtp.gmail.com")
+        smtp_port = credentials.get("smtp_port", 587)
+        sender_email = credentials.get("sender_email")
+        sender_password = credentials.get("sender_password")
+
+        if not sender_email or not sender_password:
+            return "Email credentials are missing."
+
+        try:
+            msg = MIMEText(body)
+            msg["Subject"] = subject
+            msg["From"] = sender_email
+            msg["To"] = recipient
+
+            with smtplib.SMTP(smtp_server, smtp_port) as server:
+                server.ehlo()
+                server.starttls()
+                server.ehlo()
+                server.login(sender_email, sender_password)
+                server.sendmail(sender_email, [recipient], msg.as_string())
+
+            return f"Email sent to {recipient} successfully."
+        except Exception as e:
+            return f"Error sending email: {str(e)}"
+
+    def get_pic_response(self, query):
+        """Fetch a random picture from Pexels based on the query."""
+        key = self.pexels_api_key.get()
+        if not key:
+            return "Pexels API key is missing."
+        elif not query:
+            return "Please specify a query."
+        else:
+            url = "https://api.pexels.com/v1/search"
+            headers = {
+                "Authorization": key
+            }
+            params = {
+                "query": query,
+                "per_page": 1,
+                "page": 1
+            }
+            try:
+                r = self.http.get(url, headers=headers, params=params)
+                r.raise_for_status()  # Raise an HTTPError for bad responses
+                data = r.json()
+                photos = data.get("photos", [])
+                if not photos:
+                    return f"No pictures found for '{query}'."
+                else:
+                    photo_url = photos[0]["src"]["original"]
+                    return f"Here is a picture of {query}: {photo_url}"
+            except requests.exceptions.RequestException as e:
+                return f"Error fetching picture: {str(e)}"
+
+    def get_blaz_response(self, call_letters):
+        """Handle the !blaz command to return the radio station's live broadcast link based on call letters."""
+        radio_links = {
+            "WPBG": "https://playerservices.streamtheworld.com/api/livestream-redirect/WPBGFM.mp3",
+            "WSWT": "https://playerservices.streamtheworld.com/api/livestream-redirect/WSWTFM.mp3",
+            "WMBD": "https://playerservices.streamtheworld.com/api/livestream-redirect/WMBDAM.mp3",
+            "WIRL": "https://playerservices.streamtheworld.com/api/livestream-redirect/WIRLAM.mp3",
+            "WXCL": "https://playerservices.streamtheworld.com/api/livestream-redirect/WXCLFM.mp3",
+            "WKZF": "https://playerservices.streamtheworld.com/api/livestream-redirect/WKZFFM.mp3"
+        }
+        stream_link = radio_links.get(call_letters.upper(), "No matching radio station found.")
+        return f"Listen to {call_letters.upper()} live: {stream_link}"
+
+    def get_radio_response(self, query):
+        """Handle the !radio command to return an internet radio station link based on the search query."""
+        if not query:
+            response = "Please provide a search query in quotes, e.g., !radio \"classic rock\"."
+        else:
+            # Example implementation using a predefined list of radio stations
+            radio_stations = {
+                "classic rock": "https://www.classicrockradio.com/stream",
+                "jazz": "https://www.jazzradio.com/stream",
+                "pop": "https://www.popradio.com/stream",
+                "news": "https://www.newsradio.com/stream"
+            }
+            station_link = radio_stations.get(query.lower(), "No matching radio station found.")
+            response = f"Radio station for '{query}': {station_link}"
+        return response
+
+    def get_musk_post(self):
+        """Run the Musk post scraper script and return the latest post."""
+        try:
+            command = [
+                sys.executable,
+                r"C:\Users\Noah\OneDrive\Documents\bbschatbot1.0\MusksLatestPostScraper.py"
+            ]
+            result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', errors='ignore', timeout=180)
+            output = result.stdout.strip()
+
+            if result.returncode != 0:
+                # If the script returned a non-zero exit code
+                error_msg = result.stderr.strip() or "Unknown error from Musk scraper."
+                return f"Error from Musk post script: {error_msg}"
+
+            # Split the output into lines and get the last line
+            lines = output.splitlines()
+            if len(lines) >= 1:
+                return lines[-1]
+            else:
+                return output
+        except Exception as e:
+            return f"Error running Musk post script: {str(e)}"
@@ -0,0 +1,111 @@
+import queue
+import threading
+from collections import deque
+
+
+class TriggerDispatcher:
+    """
+    Run trigger handlers on a pool of worker threads so a slow handler
+    (ChatGPT, the scraper scripts, ...) never blocks the Tk thread or the
+    triggers queued behind it.
+
+    Jobs are submitted with a key (usually the username). Jobs that share a key
+    run one after another in submission order; jobs with different keys run in
+    parallel. Return values are pushed onto an ordered outbound queue and handed
+    to their on_result callback by a single delivery thread.
+    """
+
+    def __init__(self, workers=4, max_pending=64):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.work_queue = queue.Queue()
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._waiting = {}  # key -> deque of jobs queued behind the running one
+        self._pending = 0
+        self._threads = []
+        self._running = False
+
+    def start(self):
+        """Start the worker threads and the delivery thread."""
+        if self._running:
+            return
+        self._running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"trigger-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._deliver, name="trigger-delivery", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self):
+        """Ask all threads to exit once the queued work is done."""
+        if not self._running:
+            return
+        self._running = False
+        for _ in range(self.workers):
+            self.work_queue.put(None)
+        self.results.put(None)
+        self._threads = []
+
+    def submit(self, key, func, *args, on_result=None, **kwargs):
+        """
+        Queue func(*args, **kwargs) to run on a worker.
+        Returns False if the work queue is full and the job was dropped.
+        """
+        job = (key, func, args, kwargs, on_result)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            if key in self._waiting:
+                # Another job for this key is running; keep per-key order.
+                self._waiting[key].append(job)
+                return True
+            self._waiting[key] = deque()
+        self.work_queue.put(job)
+        return True
+
+    def pending(self):
+        """Number of jobs queued or running."""
+        with self._lock:
+            return self._pending
+
+    def _worker(self):
+        while True:
+            job = self.work_queue.get()
+            if job is None:
+                break
+            key, func, args, kwargs, on_result = job
+            try:
+                result = func(*args, **kwargs)
+                if on_result is not None and result is not None:
+                    self.results.put((on_result, result))
+            except Exception as e:
+                print(f"Error in trigger handler {getattr(func, '__name__', func)}: {e}")
+            finally:
+                self._finish(key)
+
+    def _finish(self, key):
+        with self._lock:
+            self._pending -= 1
+            waiting = self._waiting.get(key)
+            if waiting:
+                next_job = waiting.popleft()
+            else:
+                self._waiting.pop(key, None)
+                next_job = None
+        if next_job is not None:
+            self.work_queue.put(next_job)
+
+    def _deliver(self):
+        while True:
+            item = self.results.get()
+            if item is None:
+                break
+            on_result, result = item
+            try:
+                on_result(result)
+            except Exception as e:
+                print(f"Error delivering trigger result: {e}")
@@ -0,0 +1,134 @@
+"""
+Incremental framing of the telnet stream into decoded lines.
+
+LineFramer takes reads as they arrive (CP437 bytes or already-decoded text)
+and returns each complete line exactly once, as a FramedLine holding the raw
+text (ANSI codes kept, for scrollback), the clean text (no escape sequences,
+for trigger parsing) and styled segments (for the display). Partial reads
+are kept as a list of pieces, so a long screen with no newline costs one
+join when its line ends instead of a copy on every read. Foreground colour
+and any escape sequence cut off by a read boundary carry over to the next
+line.
+"""
+import codecs
+import re
+from collections import namedtuple
+
+# Complete escape sequences: CSI (ESC [ params intermediates final) or a two-character ESC form.
+# split() on it yields text, params, final, text, ... (params/final are None for the short form).
+ESCAPE_SEQUENCE = re.compile(r'\x1b(?:\[([0-?]*)[ -/]*([@-~])|[@-Z\\-_])')
+# An escape sequence cut off at the end of the text
+PARTIAL_ESCAPE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*)?$')
+
+FOREGROUND_CODES = frozenset([str(code) for code in range(30, 38)] + [str(code) for code in range(90, 98)])
+
+# segments: tuple of (text, fg) where fg is the SGR foreground code in effect ("31", "96", ...) or None
+FramedLine = namedtuple("FramedLine", "raw clean segments")
+
+
+class AnsiDecoder:
+    """
+    Split text into plain segments and track the SGR foreground colour.
+
+    Only foreground colours affect the segments; every other escape sequence
+    (cursor movement, erase, ...) is dropped from the clean text.
+    """
+
+    def __init__(self):
+        self.fg = None
+        self.carry = ""  # start of an escape sequence cut off by a forced line break
+
+    def decode(self, text, complete=True):
+        """
+        Return (clean, segments) for text. With complete=False an escape
+        sequence cut off at the end is held back and joined to the next call.
+        """
+        if self.carry:
+            text = self.carry + text
+            self.carry = ""
+        if "\x1b" not in text:
+            return text, ((text, self.fg),) if text else ()
+        partial = PARTIAL_ESCAPE.search(text)
+        if partial:
+            if not complete:
+                self.carry = text[partial.start():]
+            text = text[:partial.start()]
+
+        parts = ESCAPE_SEQUENCE.split(text)
+        segments = []
+        if parts[0]:
+            segments.append((parts[0], self.fg))
+        for i in range(1, len(parts), 3):
+            if parts[i + 1] == "m":
+                self._apply_sgr(parts[i])
+            if parts[i + 2]:
+                segments.append((parts[i + 2], self.fg))
+        return "".join(parts[::3]), tuple(segments)
+
+    def _apply_sgr(self, params):
+        for code in params.split(";"):
+            code = code.lstrip("0") or "0"
+            if code in ("0", "39"):
+                self.fg = None
+            elif code in FOREGROUND_CODES:
+                self.fg = code
+
+
+class LineFramer:
+    """
+    Turn telnet reads into FramedLines.
+
+    CR LF, lone CR and lone LF all end a line, including a CR LF split across
+    two reads. A line longer than `max_line` characters is emitted in pieces
+    so a stream that never sends a newline can't grow without bound.
+    """
+
+    def __init__(self, encoding="cp437", max_line=65536):
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.ansi = AnsiDecoder()
+        self.max_line = max_line
+        self.pieces = []  # text of the current partial line
+        self.pending_length = 0
+        self.skip_lf = False  # the last read ended with CR; a leading LF belongs to it
+
+    def feed(self, data):
+        """Add one read (bytes or str); return the lines it completed."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = self.decoder.decode(bytes(data))
+        if self.skip_lf and data:
+            if data.startswith("\n"):
+                data = data[1:]
+            self.skip_lf = False  # Even when that LF was the whole read
+        if not data:
+            return []
+        self.skip_lf = data.endswith("\r")
+        if "\r" in data:
+            data = data.replace("\r\n", "\n").replace("\r", "\n")
+
+        texts = data.split("\n")
+        tail = texts.pop()
+        lines = []
+        if texts:
+            self.pieces.append(texts[0])
+            texts[0] = "".join(self.pieces)
+            self.pieces = []
+            self.pending_length = 0
+            decode = self.ansi.decode
+            lines = [FramedLine(raw, *decode(raw)) for raw in texts]
+        if tail:
+            self.pieces.append(tail)
+            self.pending_length += len(tail)
+            if self.pending_length > self.max_line:
+                lines.append(self._emit(complete=False))
+        return lines
+
+    def partial(self):
+        """Return the raw text of the line received so far."""
+        return "".join(self.pieces)
+
+    def _emit(self, complete):
+        raw = "".join(self.pieces)
+        self.pieces = []
+        self.pending_length = 0
+        clean, segments = self.ansi.decode(raw, complete)
+        return FramedLine(raw, clean, segments)
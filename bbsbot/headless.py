@@ -0,0 +1,82 @@
+"""
+Run the bot core without a GUI.
+
+Terminal output goes to the log (ANSI codes stripped) instead of a Text
+widget, so the bot can run on a server or under systemd with no display.
+"""
+import logging
+import signal
+import threading
+
+from bbsbot.classifier import ANSI_ESCAPE
+from bbsbot.core import BotCore
+from bbsbot.sessions import SessionManager, load_favorite_addresses
+
+
+class LogFrontend:
+    """Front end that writes each complete terminal line to the log."""
+
+    def __init__(self, name=None):
+        self.logger = logging.getLogger("ultron.terminal" + (f".{name}" if name else ""))
+        self.partial_line = ""
+        self.lock = threading.Lock()
+
+    def show_text(self, text):
+        with self.lock:
+            lines = (self.partial_line + text).split("\n")
+            self.partial_line = lines.pop()
+        for line in lines:
+            self.logger.info("%s", ANSI_ESCAPE.sub("", line).rstrip())
+
+    def show_lines(self, lines):
+        for line in lines:
+            self.logger.info("%s", line.clean.rstrip())
+
+    def connection_changed(self, connected):
+        self.logger.info("Session %s", "connected" if connected else "disconnected")
+
+
+def wait_for_signal():
+    """Block until SIGINT or SIGTERM."""
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    while not stop.wait(1):
+        pass
+
+
+def run(host, port, auto_login=False):
+    """Connect to host:port and serve triggers until SIGINT or SIGTERM."""
+    core = BotCore()
+    core.frontend = LogFrontend()
+    core.host.set(host)
+    core.port.set(port)
+    core.auto_login_enabled.set(auto_login)
+
+    core.start()
+    core.start_connection()
+    try:
+        wait_for_signal()
+    finally:
+        core.shutdown()
+
+
+def run_many(addresses, auto_login=False):
+    """Connect to every address on one event loop until SIGINT or SIGTERM."""
+    manager = SessionManager(LogFrontend)
+    for address in addresses:
+        manager.add(address, auto_login=auto_login)
+
+    manager.start_all()
+    try:
+        wait_for_signal()
+    finally:
+        manager.shutdown()
+
+
+def run_favorites(auto_login=False):
+    """Run one session per favorites.json entry."""
+    addresses = load_favorite_addresses()
+    if not addresses:
+        raise SystemExit("favorites.json has no BBS addresses")
+    run_many(addresses, auto_login=auto_login)
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque, namedtuple
+
+logger = logging.getLogger(__name__)
+
+PublicMessage = namedtuple("PublicMessage", "seq time username text")
+
+SPAN = re.compile(r'^(\d+)([smhd])$')
+SPAN_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_span(text):
+    """Seconds in a span such as "90s", "10m", "2h" or "1d"; None if text isn't one."""
+    match = SPAN.match(text.lower())
+    return int(match.group(1)) * SPAN_SECONDS[match.group(2)] if match else None
+
+
+class PublicHistory:
+    """
+    The last `capacity` public lines said in a room, oldest overwritten first.
+
+    Lines live in a fixed list used as a ring, addressed by a running sequence
+    number (slot = seq % capacity), so any line is reached in O(1). Each user
+    has a deque of the sequence numbers of their last `per_user` lines; an
+    entry whose slot has since been reused is skipped, and a user whose
+    newest line falls out of the ring is forgotten, so memory stays bounded
+    no matter how many people pass through. All methods are thread-safe.
+
+    save() writes the lines oldest first as compact JSON arrays to a
+    temporary file and swaps it in; a background thread saves every
+    `save_interval` seconds while there is something new, and stop() saves
+    once more. load() also reads the older {username: [line, ...]} file,
+    which had no times; those lines are dated to the file's modification
+    time and rewritten in the new format on the next save.
+    """
+
+    def __init__(self, path, capacity=5000, per_user=50, save_interval=60):
+        self.path = path
+        self.capacity = max(1, int(capacity))
+        self.per_user = max(1, int(per_user))
+        self.save_interval = save_interval
+        self.slots = [None] * self.capacity
+        self.next_seq = 0
+        self.by_user = {}  # lower-cased username -> deque of seq
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, username, text, when=None):
+        when = time.time() if when is None else when
+        key = username.lower()
+        with self.lock:
+            seq = self.next_seq
+            slot = seq % self.capacity
+            evicted = self.slots[slot]
+            if evicted is not None:
+                owner = evicted.username.lower()
+                seqs = self.by_user.get(owner)
+                if seqs and seqs[-1] == evicted.seq:
+                    del self.by_user[owner]
+            self.slots[slot] = PublicMessage(seq, when, username, text)
+            self.next_seq = seq + 1
+            seqs = self.by_user.get(key)
+            if seqs is None:
+                seqs = self.by_user[key] = deque(maxlen=self.per_user)
+            seqs.append(seq)
+            self.dirty = True
+
+    def _get(self, seq):
+        """The line with this seq, or None if it has been overwritten; caller holds the lock."""
+        if seq < self.next_seq - self.capacity:
+            return None
+        return self.slots[seq % self.capacity]
+
+    def recent(self, count, username=None, since=None):
+        """Up to count lines, oldest first; only username's if given, only newer than `since` if given."""
+        with self.lock:
+            if username is None:
+                seqs = range(self.next_seq - 1, max(-1, self.next_seq - 1 - self.capacity), -1)
+            else:
+                seqs = reversed(self.by_user.get(username.lower(), ()))
+            found = []
+            for seq in seqs:
+                if len(found) >= count:
+                    break
+                message = self._get(seq)
+                if message is None or (since is not None and message.time < since):
+                    break
+                found.append(message)
+        found.reverse()
+        return found
+
+    def __len__(self):
+        return min(self.next_seq, self.capacity)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.error("Could not read %s: %s", self.path, e)
+            return
+        if isinstance(data, dict) and "messages" in data:
+            messages = data["messages"]
+            legacy = False
+        else:
+            when = os.path.getmtime(self.path)
+            messages = [[when, username, text] for username, texts in data.items() for text in texts]
+            legacy = True
+        for when, username, text in messages[-self.capacity:]:
+            self.add(username, text, when)
+        self.dirty = legacy and bool(messages)  # Save once in the new format
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            messages = [[round(m.time, 1), m.username, m.text] for m in (self._get(seq) for seq in
+                        range(max(0, self.next_seq - self.capacity), self.next_seq)) if m is not None]
+            self.dirty = False
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "w") as file:
+                json.dump({"version": 1, "messages": messages}, file, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logger.error("Could not save %s: %s", self.path, e)
+            self.dirty = True
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="said-history-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=10):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(timeout)
+            self.thread = None
+        self.save()
+
+    def _run(self):
+        while not self.stop_event.wait(self.save_interval):
+            self.save()
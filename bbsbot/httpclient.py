@@ -0,0 +1,52 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HTTPClient:
+    """
+    One pooled requests.Session shared by every external lookup.
+
+    Connections are kept alive per host, every request gets a default timeout,
+    and connection errors and 429/5xx responses are retried with exponential
+    backoff. Sessions are safe to share between the trigger worker threads.
+    `endpoints` maps an API origin ("https://api.pexels.com") to the origin
+    to use instead, e.g. a local mock server.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, timeout=10, retries=2, backoff=0.5, pool_size=10, endpoints=None):
+        self.timeout = timeout
+        self.endpoints = dict(endpoints or {})
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False  # hand the last response back to the caller
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        for origin, replacement in self.endpoints.items():
+            if url.startswith(origin):
+                url = replacement + url[len(origin):]
+                break
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,54 @@
+"""
+Per-board keep-alive settings.
+
+A profile is {"mode": ..., "idle": seconds}. The keep-alive fires only after
+`idle` seconds with nothing sent or received. Modes:
+
+    "nop"    telnet IAC NOP: keeps NAT and firewall state alive, prints nothing
+    "enter"  a bare ENTER, for boards whose own idle timer only counts keystrokes
+    "auto"   NOP if the server negotiated telnet options, otherwise ENTER
+    "off"    never send anything
+
+Invariant: under "nop" or "off" nothing is ever typed into the room while
+the session is idle. Both senders of idle-time traffic, the keep-alive task
+and the silence probe in BotCore.read_until_closed, go through
+send_keepalive(), which only sends an ENTER for "enter", or for "auto" on a
+board that negotiated no telnet options.
+"""
+from bbsbot.config import DEFAULT_KEEPALIVE, KEEPALIVE_PROFILES
+
+IAC_NOP = bytes([255, 241])
+
+
+def keepalive_profile(host):
+    """Return the keep-alive profile for host: the defaults with its overrides applied."""
+    profile = dict(DEFAULT_KEEPALIVE)
+    profile.update(KEEPALIVE_PROFILES.get(host.lower(), {}))
+    return profile
+
+
+def telnet_negotiated(writer):
+    """True if the server agreed to any telnet option, i.e. it speaks telnet and will ignore a NOP."""
+    options = getattr(writer, "remote_option", None)
+    return bool(options) and any(options.values())
+
+
+def send_keepalive(writer, mode, send_enter):
+    """
+    Send one keep-alive of the given mode; send_enter queues an ENTER.
+    Returns what went out: "nop", "enter", or None. "nop" sends nothing
+    rather than fall back to an ENTER on a writer that can't send telnet
+    commands.
+    """
+    if mode == "off":
+        return None
+    if mode == "auto":
+        mode = "nop" if telnet_negotiated(writer) else "enter"
+    if mode == "nop":
+        send_iac = getattr(writer, "send_iac", None)
+        if send_iac is None:
+            return None
+        send_iac(IAC_NOP)
+        return "nop"
+    send_enter()
+    return "enter"
@@ -0,0 +1,50 @@
+class LoginFlow:
+    """
+    Log on by answering the BBS prompts in order.
+
+    waiting -> username sent -> password sent -> done (teleconference entered).
+    A username prompt is answered until the logon is done (again after a
+    rejected attempt) but not while the username is already waiting for its
+    password, since one logon screen can match more than one username
+    pattern; the password only goes out before it has been sent once, and nothing is answered once the bot is in the teleconference, so
+    chat text that happens to contain a prompt can't make it type its
+    password into the room. reset() starts over for a new connection.
+    """
+
+    WAITING = "waiting"
+    USERNAME_SENT = "username sent"
+    PASSWORD_SENT = "password sent"
+    DONE = "done"
+
+    def __init__(self, send_username, send_password, enter_teleconference):
+        self.send_username = send_username
+        self.send_password = send_password
+        self.enter_teleconference = enter_teleconference
+        self.state = self.WAITING
+
+    @property
+    def in_progress(self):
+        """True between sending the username and entering the teleconference."""
+        return self.state in (self.USERNAME_SENT, self.PASSWORD_SENT)
+
+    def reset(self):
+        self.state = self.WAITING
+
+    def start(self):
+        """Send the username now; the prompts that follow drive the rest."""
+        self.send_username()
+        self.state = self.USERNAME_SENT
+
+    def on_prompt(self, name):
+        """Advance on a prompt name from bbsbot.classifier.PROMPTS."""
+        if self.state == self.DONE:
+            return
+        if name == "username":
+            if self.state != self.USERNAME_SENT:
+                self.start()
+        elif name == "password" and self.state in (self.WAITING, self.USERNAME_SENT):
+            self.send_password()
+            self.state = self.PASSWORD_SENT
+        elif name == "greetings":
+            self.enter_teleconference()
+            self.state = self.DONE
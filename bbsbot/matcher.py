@@ -0,0 +1,62 @@
+from collections import deque
+
+
+class MultiMatcher:
+    """
+    Aho-Corasick scanner for a fixed table of literal patterns.
+
+    Built once from a {pattern: value} table. feed() walks the text in one
+    pass and returns the value of every pattern that ends in it, in order.
+    The automaton state is kept between calls, so a pattern split across two
+    reads still matches. Matching is case-insensitive.
+    """
+
+    def __init__(self, table):
+        goto = [{}]  # trie edges
+        outputs = [()]
+        for pattern, value in table.items():
+            state = 0
+            for char in pattern.lower():
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state] += (value,)
+
+        # Breadth-first, so a state's failure target (always shallower) is complete
+        # before the state itself; each state's transitions then cover every
+        # character, and the scan never has to walk failure links.
+        fail = [0] * len(goto)
+        self.transitions = [None] * len(goto)
+        self.transitions[0] = dict(goto[0])
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            fallback = self.transitions[fail[state]]
+            self.transitions[state] = {**fallback, **goto[state]}
+            outputs[state] += outputs[fail[state]]
+            for char, next_state in goto[state].items():
+                fail[next_state] = fallback.get(char, 0)
+                pending.append(next_state)
+        self.outputs = outputs
+        self.state = 0
+
+    def reset(self):
+        """Forget any partial match, e.g. on a new connection."""
+        self.state = 0
+
+    def feed(self, text):
+        """Scan text; return the values of the patterns completed in it."""
+        transitions = self.transitions
+        outputs = self.outputs
+        state = self.state
+        found = []
+        for char in text.lower():
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.extend(outputs[state])
+        self.state = state
+        return found
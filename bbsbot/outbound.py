@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundQueue:
+    """
+    Paced, ordered output for one telnet connection.
+
+    put() may be called from any thread. One writer coroutine on the event
+    loop sends at most `lines_per_second` lines on average, letting up to
+    `burst` lines go out together after a quiet spell; the lines sent in one
+    wake-up are joined into a single write before one drain(). Lines for a
+    target keep their order, and targets with lines waiting take turns so a
+    long reply to one user doesn't hold up the others. Once `max_pending`
+    lines are waiting, put() blocks callers that ask to block and are not on
+    the loop thread.
+    """
+
+    def __init__(self, lines_per_second=10.0, burst=3, max_pending=200):
+        self.interval = 1.0 / lines_per_second
+        self.burst = max(1, int(burst))
+        self.max_pending = max(1, int(max_pending))
+        self.pending = OrderedDict()  # target -> deque of lines, in turn order
+        self.count = 0  # lines waiting across all targets
+        self.lock = threading.Condition()
+        self.closed = True
+        self.loop = None
+        self.loop_thread_id = None
+        self.wakeup = None
+        self.task = None
+        self.last_write = time.monotonic()  # when the writer last sent anything
+
+    def start(self, loop, writer):
+        """Start the writer coroutine for a new connection; call on the loop thread."""
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.wakeup = asyncio.Event()
+        with self.lock:
+            self.closed = False
+        self.task = loop.create_task(self._run(writer))
+
+    def close(self):
+        """Stop the writer, drop whatever is queued and release blocked producers."""
+        with self.lock:
+            self.closed = True
+            self.pending.clear()
+            self.count = 0
+            self.lock.notify_all()
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def put(self, lines, target=None, block=True, timeout=30):
+        """
+        Queue lines (each ending in CRLF) for target.
+
+        Returns False, dropping the lines, if no connection is open. A caller
+        blocked for longer than `timeout` seconds is let through anyway.
+        """
+        if isinstance(lines, str):
+            lines = [lines]
+        block = block and threading.get_ident() != self.loop_thread_id
+        with self.lock:
+            if block:
+                deadline = time.monotonic() + timeout
+                while not self.closed and self.count >= self.max_pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning("Outbound queue still full after %ss; queueing anyway", timeout)
+                        break
+                    self.lock.wait(remaining)
+            if self.closed:
+                return False
+            self.pending.setdefault(target, deque()).extend(lines)
+            self.count += len(lines)
+        self.loop.call_soon_threadsafe(self.wakeup.set)
+        return True
+
+    def _take(self, limit):
+        """Pop up to limit lines, one per target in turn."""
+        lines = []
+        with self.lock:
+            while self.pending and len(lines) < limit:
+                target, queued = next(iter(self.pending.items()))
+                lines.append(queued.popleft())
+                if queued:
+                    self.pending.move_to_end(target)
+                else:
+                    del self.pending[target]
+            self.count -= len(lines)
+            self.lock.notify_all()
+        return lines
+
+    async def _run(self, writer):
+        tokens = float(self.burst)
+        last = time.monotonic()
+        try:
+            while True:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while True:
+                    now = time.monotonic()
+                    tokens = min(self.burst, tokens + (now - last) / self.interval)
+                    last = now
+                    if tokens < 1:
+                        await asyncio.sleep((1 - tokens) * self.interval)
+                        continue
+                    lines = self._take(int(tokens))
+                    if not lines:
+                        break
+                    tokens -= len(lines)
+                    writer.write("".join(lines))
+                    self.last_write = time.monotonic()
+                    await writer.drain()
+        except Exception as e:
+            logger.warning("Outbound writer stopped: %s", e)
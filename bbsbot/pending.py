@@ -0,0 +1,58 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RecipientIndex:
+    """
+    Local set of recipients with messages waiting in the PendingMessages table.
+
+    Built from one projected scan and kept current by the bot's own saves and
+    deliveries, it lets a who-list skip the per-member DynamoDB query for
+    everyone without mail. Until a scan has succeeded, and again once it is
+    older than `max_age` seconds (another process may share the table),
+    might_have() answers True so no message goes undelivered.
+    """
+
+    def __init__(self, max_age=900):
+        self.max_age = max_age
+        self.recipients = set()
+        self.loaded_at = None  # monotonic time of the last successful scan
+        self.lock = threading.Lock()
+
+    def load(self, table):
+        """Rebuild from a scan of table (recipient attribute only). Returns False if the scan failed."""
+        recipients = set()
+        kwargs = {"ProjectionExpression": "recipient"}
+        try:
+            while True:
+                response = table.scan(**kwargs)
+                recipients.update(item["recipient"] for item in response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except Exception as e:
+            logger.warning("Could not scan pending messages: %s", e)
+            return False
+        with self.lock:
+            self.recipients = recipients
+            self.loaded_at = time.monotonic()
+        logger.debug("Pending messages waiting for %d recipients", len(recipients))
+        return True
+
+    def stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age
+
+    def might_have(self, recipient):
+        with self.lock:
+            return self.loaded_at is None or recipient.lower() in self.recipients
+
+    def add(self, recipient):
+        with self.lock:
+            self.recipients.add(recipient.lower())
+
+    def discard(self, recipient):
+        with self.lock:
+            self.recipients.discard(recipient.lower())
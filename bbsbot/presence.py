@@ -0,0 +1,285 @@
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# What a BBS handle looks like once lower-cased and stripped of @host ("bill.the.cat", "123qwe")
+HANDLE = re.compile(r'^[\w.\-]+$')
+
+
+def format_age(seconds):
+    """Compact age: "45s ago", "12m ago", "3h 5m ago", "2d 4h ago"."""
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds}s ago"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m ago"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m ago"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h ago"
+
+
+def normalize_name(name):
+    """Lookup key for a handle: lower case without @host; None for entries that aren't a handle (URLs, ...)."""
+    name = name.strip().lower().split("@", 1)[0]
+    return name if HANDLE.match(name) else None
+
+
+class PresenceIndex:
+    """
+    Last-seen times by normalized handle, with a trie for prefix and typo search.
+
+    "name" and "name@host" fold into one entry holding the later time. The
+    trie is a dict per node keyed by character; the "" key of a node holds the
+    handle that ends there. Not thread-safe; LastSeenStore guards it.
+    """
+
+    def __init__(self):
+        self.times = {}
+        self.root = {}
+
+    def add(self, name, when):
+        key = normalize_name(name)
+        if key is None:
+            return
+        if key not in self.times:
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = key
+        elif when <= self.times[key]:
+            return
+        self.times[key] = when
+
+    def get(self, name):
+        key = normalize_name(name)
+        return self.times.get(key) if key else None
+
+    def prefix(self, prefix, limit=5):
+        """The `limit` most recently seen handles starting with prefix, as (handle, time) pairs."""
+        node = self.root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        names = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char:
+                    stack.append(child)
+                else:
+                    names.append(child)
+        return heapq.nlargest(limit, ((name, self.times[name]) for name in names), key=lambda item: item[1])
+
+    def similar(self, name, max_distance=2, limit=3):
+        """
+        Handles within max_distance edits of name, closest (then most recent)
+        first, as (handle, time) pairs. Swapped neighbours count as one edit
+        ("nigth"). Walks the trie with one edit-distance row per node, computing only the diagonal band that can stay within
+        max_distance, and prunes branches that are already too far away. The
+        first letter is taken as typed, which keeps the walk to one subtree
+        of the root; names of five letters or fewer allow one edit, and two or
+        fewer none.
+        """
+        word = name.lower()
+        if not word or word[0] not in self.root:
+            return []
+        max_distance = min(max_distance, 0 if len(word) <= 2 else 1 if len(word) <= 5 else 2)
+        found = []
+        length = len(word)
+        too_far = max_distance + 1
+
+        def search(node, char, depth, previous_row, previous_char, row_before):
+            # Cells more than max_distance off the diagonal can't lead to a match
+            low = max(1, depth - max_distance)
+            high = min(length, depth + max_distance)
+            row = [depth if depth <= max_distance else too_far] + [too_far] * length
+            best = row[0]
+            for column in range(low, high + 1):
+                value = min(
+                    row[column - 1] + 1,
+                    previous_row[column] + 1,
+                    previous_row[column - 1] + (word[column - 1] != char)
+                )
+                if column > 1 and char == word[column - 2] and previous_char == word[column - 1]:
+                    value = min(value, row_before[column - 2] + 1)
+                row[column] = value
+                if value < best:
+                    best = value
+            if row[length] <= max_distance and "" in node:
+                found.append((row[length], -self.times[node[""]], node[""]))
+            if best <= max_distance:
+                for next_char, child in node.items():
+                    if next_char:
+                        search(child, next_char, depth + 1, row, char, previous_row)
+
+        first_row = [min(column, too_far) for column in range(length + 1)]
+        search(self.root[word[0]], word[0], 1, first_row, None, None)
+        return [(handle, -negative_time) for _, negative_time, handle in sorted(found)[:limit]]
+
+
+class LastSeenStore:
+    """
+    Last-seen times by lower-cased username, kept in memory and persisted as
+    a snapshot file plus an append-only journal. Lookups go through a
+    PresenceIndex built at load and kept current by touch().
+
+    touch() only marks a name dirty when its stored time is more than
+    `resolution` seconds old, so a room that sits still costs no writes. A
+    background thread appends the dirty entries to the journal as one JSON
+    line every `flush_interval` seconds; once the journal holds
+    `compact_after` lines it is folded into the snapshot, which is written to
+    a temporary file and swapped in with os.replace(). load() reads the
+    snapshot and replays the journal, skipping a line cut short by a crash
+    (and compacting, so nothing is appended after it).
+    """
+
+    def __init__(self, path="last_seen.json", flush_interval=30, resolution=60, compact_after=500):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.flush_interval = flush_interval
+        self.resolution = resolution
+        self.compact_after = compact_after
+        self.times = {}
+        self.index = PresenceIndex()
+        self.dirty = {}
+        self.journal_lines = 0
+        self.lock = threading.Lock()  # guards times and dirty
+        self.file_lock = threading.Lock()  # one writer of the files at a time
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def load(self):
+        times = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as file:
+                    times = {name.lower(): int(when) for name, when in json.load(file).items()}
+            except (OSError, ValueError) as e:
+                logger.error("Could not read %s: %s", self.path, e)
+        lines = 0
+        damaged = False
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as file:
+                for line in file:
+                    try:
+                        entries = json.loads(line)
+                    except ValueError:
+                        logger.warning("Skipping a damaged line in %s", self.journal_path)
+                        damaged = True
+                        continue
+                    for name, when in entries.items():
+                        if when > times.get(name, 0):
+                            times[name] = when
+                    lines += 1
+        index = PresenceIndex()
+        for name, when in times.items():
+            index.add(name, when)
+        with self.lock:
+            self.times = times
+            self.index = index
+            self.journal_lines = lines
+        if damaged:
+            self.compact()  # Later appends must not land on the end of a torn line
+
+    def touch(self, names, when=None):
+        """Record that names were seen at `when` (default now)."""
+        when = int(when or time.time())
+        with self.lock:
+            for name in names:
+                name = name.lower()
+                if when - self.times.get(name, 0) > self.resolution:
+                    self.times[name] = when
+                    self.dirty[name] = when
+                    self.index.add(name, when)
+
+    def get(self, name):
+        """Last-seen time of a handle (any case, with or without @host), or None."""
+        with self.lock:
+            return self.index.get(name)
+
+    def matching(self, prefix, limit=5):
+        """Most recently seen handles starting with prefix: [(handle, time)]."""
+        with self.lock:
+            return self.index.prefix(prefix, limit)
+
+    def similar(self, name, max_distance=2, limit=3):
+        """Handles within max_distance typos of name: [(handle, time)]."""
+        with self.lock:
+            return self.index.similar(name, max_distance, limit)
+
+    def items(self):
+        with self.lock:
+            return list(self.times.items())
+
+    def flush(self):
+        """Append pending changes to the journal, compacting it when it has grown long."""
+        with self.file_lock:
+            with self.lock:
+                dirty, self.dirty = self.dirty, {}
+            if dirty:
+                try:
+                    with open(self.journal_path, "a") as file:
+                        file.write(json.dumps(dirty, separators=(",", ":")) + "\n")
+                    self.journal_lines += 1
+                except OSError as e:
+                    logger.error("Could not append to %s: %s", self.journal_path, e)
+                    with self.lock:
+                        for name, when in dirty.items():
+                            self.dirty.setdefault(name, when)
+                    return
+            if self.journal_lines >= self.compact_after:
+                self._compact()
+
+    def compact(self):
+        """Write everything to the snapshot and empty the journal."""
+        with self.file_lock:
+            with self.lock:
+                self.dirty = {}
+            self._compact()
+
+    def _compact(self):
+        with self.lock:
+            snapshot = dict(self.times)
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "w") as file:
+                json.dump(snapshot, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+            # Only once the snapshot holds everything; replaying a stale journal over it is harmless
+            open(self.journal_path, "w").close()
+            self.journal_lines = 0
+        except OSError as e:
+            logger.error("Could not compact %s: %s", self.path, e)
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="last-seen-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=10):
+        """Stop the flush thread and leave everything in the snapshot."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(timeout)
+            self.thread = None
+        self.flush()
+        if self.journal_lines:
+            self.compact()
+
+    def _run(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
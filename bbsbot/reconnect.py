@@ -0,0 +1,41 @@
+import random
+import socket
+
+
+class Backoff:
+    """
+    Jittered exponential backoff.
+
+    The nth delay is drawn between half and all of min(cap, base * 2**n), so
+    a dropped session is retried within seconds while a board that stays
+    down is polled less and less often, and several sessions dropped at once
+    don't all retry in step.
+    """
+
+    def __init__(self, base=2.0, cap=300.0):
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def next_delay(self):
+        ceiling = min(self.cap, self.base * 2 ** self.attempt)
+        self.attempt += 1
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def reset(self):
+        self.attempt = 0
+
+
+def enable_tcp_keepalive(sock, idle=60, interval=15, count=4):
+    """
+    Let the kernel probe an idle connection, so a peer that vanished without
+    closing (a half-open socket) is reported as an error within a few minutes.
+    Options the platform lacks are skipped.
+    """
+    if sock is None:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for name, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", interval), ("TCP_KEEPCNT", count)):
+        option = getattr(socket, name, None)
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import namedtuple
+
+# members: frozenset of usernames in the channel; online: users seen logging on to the board.
+# version goes up on every change, synced_at is when the last full who-list arrived (0 = never).
+RoomSnapshot = namedtuple("RoomSnapshot", "version members online synced_at")
+
+
+class RoomState:
+    """
+    Who is in the teleconference channel, kept current from the stream.
+
+    Join and leave lines and "is now online" notices adjust the state as they
+    arrive; a who-list replaces the member set outright. Every change
+    publishes a new immutable RoomSnapshot, so any thread reads
+    `room.snapshot` without locking and never sees a half-applied update.
+    Usernames are kept as the BBS shows them (no @host) and compared without
+    regard to case.
+    """
+
+    def __init__(self):
+        self.changed = threading.Condition()
+        self.snapshot = RoomSnapshot(0, frozenset(), frozenset(), 0.0)
+
+    def _publish(self, members, online, synced_at=None):
+        """Install a new snapshot if anything changed; caller holds self.changed."""
+        old = self.snapshot
+        if synced_at is None:
+            if members == old.members and online == old.online:
+                return old
+            synced_at = old.synced_at
+        self.snapshot = RoomSnapshot(old.version + 1, frozenset(members), frozenset(online), synced_at)
+        self.changed.notify_all()
+        return self.snapshot
+
+    def sync(self, usernames):
+        """Replace the member list from a parsed who-list; return (joined, left) sets of names."""
+        with self.changed:
+            old = self.snapshot
+            members = frozenset(usernames)
+            joined = {name for name in members if not _contains(old.members, name)}
+            left = {name for name in old.members if not _contains(members, name)}
+            self._publish(members, old.online | members, time.time())
+        return joined, left
+
+    def join(self, username):
+        """Record a join line; returns True if the user was not already listed."""
+        username = _base_name(username)
+        with self.changed:
+            old = self.snapshot
+            if _contains(old.members, username):
+                return False
+            self._publish(old.members | {username}, old.online | {username})
+        return True
+
+    def leave(self, username):
+        """Record a user leaving the channel."""
+        username = _base_name(username).lower()
+        with self.changed:
+            old = self.snapshot
+            self._publish({name for name in old.members if name.lower() != username}, old.online)
+
+    def came_online(self, username):
+        """Record an "is now online" notice."""
+        username = _base_name(username)
+        with self.changed:
+            old = self.snapshot
+            if not _contains(old.online, username):
+                self._publish(old.members, old.online | {username})
+
+    def clear(self):
+        """Forget everything, e.g. when the connection drops."""
+        with self.changed:
+            self._publish(frozenset(), frozenset(), 0.0)
+
+    def wait_for_sync(self, after, timeout):
+        """Block until a who-list newer than time `after` arrives or timeout passes; return the snapshot."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.snapshot.synced_at > after, timeout)
+            return self.snapshot
+
+
+def _base_name(username):
+    return username.strip().split("@")[0]
+
+
+def _contains(names, username):
+    if username in names:
+        return True
+    username = username.lower()
+    return any(name.lower() == username for name in names)
@@ -0,0 +1,120 @@
+"""
+Bounded scrollback for the terminal display.
+
+Scrollback mirrors the lines shown in the Text widget and caps them; lines
+trimmed off the top are appended to a ScrollbackLog on disk, from which they
+can be read back a page at a time when the user scrolls up.
+"""
+from array import array
+from collections import deque
+
+
+class ScrollbackLog:
+    """Append-only on-disk line log with an in-memory offset index for random reads."""
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.offsets = array('Q')  # byte offset where each line starts
+        self.size = 0
+        self.file = open(path, "w+b")  # start a fresh log each session
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, lines):
+        """Append lines (without trailing newlines) to the log."""
+        if not lines:
+            return
+        chunks = []
+        for line in lines:
+            data = line.encode(self.encoding, errors="replace") + b"\n"
+            self.offsets.append(self.size)
+            self.size += len(data)
+            chunks.append(data)
+        self.file.seek(0, 2)
+        self.file.write(b"".join(chunks))
+
+    def read(self, start, end):
+        """Return lines start..end-1."""
+        start = max(0, start)
+        end = min(end, len(self.offsets))
+        if start >= end:
+            return []
+        first = self.offsets[start]
+        last = self.offsets[end] if end < len(self.offsets) else self.size
+        self.file.flush()
+        self.file.seek(first)
+        data = self.file.read(last - first)
+        return data.decode(self.encoding, errors="replace").split("\n")[:end - start]
+
+    def close(self):
+        try:
+            self.file.close()
+        except OSError:
+            pass
+
+
+class Scrollback:
+    """
+    Ring buffer of the lines currently in the terminal widget.
+
+    The widget holds `restored` lines read back from the log, then the lines in
+    the ring, then the current partial line.
+    """
+
+    def __init__(self, max_lines, log=None, trim_batch=None):
+        self.max_lines = max(1, int(max_lines))
+        self.trim_batch = trim_batch if trim_batch is not None else max(1, self.max_lines // 10)
+        self.log = log
+        self.lines = deque()
+        self.partial = ""
+        self.restored = 0
+
+    def feed(self, text):
+        """Record text that was appended to the widget."""
+        parts = (self.partial + text).split("\n")
+        self.partial = parts.pop()
+        self.lines.extend(parts)
+
+    def line_count(self):
+        """Number of complete lines in the widget."""
+        return self.restored + len(self.lines)
+
+    def excess(self, following=True):
+        """
+        How many top lines to trim now. Trimming happens in bulk once the cap is
+        exceeded by trim_batch lines; while the user is scrolled back
+        (following=False) it waits until the widget holds three times the cap.
+        """
+        count = self.line_count()
+        limit = self.max_lines + self.trim_batch if following else self.max_lines * 3
+        if count <= limit:
+            return 0
+        return count - self.max_lines
+
+    def trim(self, count):
+        """Drop count top lines; lines not yet on disk are written to the log."""
+        from_restored = min(count, self.restored)
+        self.restored -= from_restored
+        count -= from_restored
+        spilled = [self.lines.popleft() for _ in range(min(count, len(self.lines)))]
+        if self.log is not None:
+            self.log.append(spilled)
+
+    def has_history(self):
+        """True if older lines on disk are not in the widget."""
+        return self.log is not None and len(self.log) > self.restored
+
+    def restore(self, count):
+        """Return up to count older lines from disk, oldest first, and mark them as shown."""
+        if self.log is None:
+            return []
+        end = len(self.log) - self.restored
+        lines = self.log.read(end - count, end)
+        self.restored += len(lines)
+        return lines
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
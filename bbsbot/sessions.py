@@ -0,0 +1,69 @@
+"""
+Run several BBS sessions on one event loop.
+
+Each session is a BotCore with its own connection, parser state, chat
+members and keep-alive; the event loop, trigger workers, HTTP client,
+response cache and DynamoDB tables come from one shared BotServices.
+"""
+import json
+import os
+
+from bbsbot.core import BotCore, BotServices
+
+
+def parse_address(address, default_port=23):
+    """Split a favorites entry, "host" or "host:port", into (host, port)."""
+    host, sep, port = address.strip().rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return address.strip(), default_port
+
+
+def load_favorite_addresses(path="favorites.json"):
+    """Return the addresses saved from the Favorites window."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as file:
+        return [address for address in json.load(file) if address.strip()]
+
+
+class SessionManager:
+    """
+    Owns the shared services and one BotCore per BBS address.
+
+    `frontend_factory(name)` returns the front end for the named session.
+    Session names are the addresses as given, so a board listed twice is
+    only connected once.
+    """
+
+    def __init__(self, frontend_factory, services=None):
+        self.frontend_factory = frontend_factory
+        self.services = services or BotServices()
+        self.sessions = {}  # name -> BotCore
+
+    def add(self, address, auto_login=False):
+        """Create the session for address; returns the existing one if present."""
+        name = address.strip()
+        if name in self.sessions:
+            return self.sessions[name]
+        host, port = parse_address(name)
+        core = BotCore(services=self.services, name=name)
+        core.frontend = self.frontend_factory(name)
+        core.host.set(host)
+        core.port.set(port)
+        core.auto_login_enabled.set(auto_login)
+        self.sessions[name] = core
+        return core
+
+    def start_all(self):
+        """Start the shared loop and connect every session."""
+        self.services.start()
+        for core in self.sessions.values():
+            core.start()
+            core.start_connection()
+
+    def shutdown(self):
+        """Disconnect every session, then stop the shared services."""
+        for core in self.sessions.values():
+            core.shutdown()
+        self.services.shutdown()
@@ -0,0 +1,164 @@
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from bbsbot.batching import drain_in_batches
+
+logger = logging.getLogger(__name__)
+
+TranscriptLine = namedtuple("TranscriptLine", "time room kind username text")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    room TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    username TEXT NOT NULL,
+    text TEXT NOT NULL
+)
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(
+    username, text, content='lines', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS lines_fts_insert AFTER INSERT ON lines BEGIN
+    INSERT INTO lines_fts(rowid, username, text) VALUES (new.id, new.username, new.text);
+END;
+"""
+
+# A search term: letters, digits and the like, optionally ending in * for a prefix match
+TERM = re.compile(r"[^\W_]+(?:['.\-][^\W_]+)*\*?")
+
+
+def search_terms(query):
+    """The words of a query, lower-cased, in order; punctuation is dropped."""
+    return [term.lower() for term in TERM.findall(query)]
+
+
+class TranscriptIndex:
+    """
+    Every public, whispered and paged line, in a SQLite database searchable by word.
+
+    add() only queues the line, so the connection's reader never waits on the
+    disk. A background thread writes what has queued in transactions of up to
+    `batch_size` lines, at most `flush_interval` seconds after the first one
+    arrived; stop() drains the queue. An FTS5 index over the username and text
+    columns, filled by a trigger, answers searches newest first without
+    sorting, so a query takes milliseconds however large the file gets. Where
+    SQLite was built without FTS5 searches fall back to LIKE scans.
+
+    The database runs in WAL mode, so searches from other threads read a
+    consistent view while a batch is being written.
+    """
+
+    def __init__(self, path="transcript.db", batch_size=500, flush_interval=2.0):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.fts = False
+        self.items = queue.Queue()
+        self.thread = None
+        self.reader = None
+        self.read_lock = threading.Lock()
+
+    def open(self):
+        """Create the tables if needed and open the connection searches use."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(SCHEMA)
+        try:
+            connection.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning("SQLite has no FTS5 (%s); transcript searches will scan", e)
+        connection.commit()
+        self.reader = connection
+
+    def add(self, room, kind, username, text, when=None):
+        """Queue one line for writing; never blocks."""
+        self.items.put((time.time() if when is None else when, room, kind, username, text))
+
+    def search(self, query, room=None, username=None, viewer=None, limit=5):
+        """
+        The newest lines matching every word of query (a word ending in * matches
+        as a prefix), as TranscriptLines newest first. room and username narrow
+        the search; "bob" also matches "bob@host". Lines whispered or paged to
+        the bot are private: with viewer=None all are searched, otherwise only
+        the viewer's own (so viewer="" gives public lines only).
+        """
+        terms = search_terms(query)
+        if not terms or self.reader is None:
+            return []
+        conditions = []
+        params = []
+        if self.fts:
+            match = " ".join('"{}"{}'.format(term.rstrip("*"), "*" if term.endswith("*") else "") for term in terms)
+            if username:
+                match = 'username : "{}" AND ({})'.format(username.lower().replace('"', ""), match)
+            sql = "SELECT l.time, l.room, l.kind, l.username, l.text FROM lines_fts JOIN lines l ON l.id = lines_fts.rowid"
+            conditions.append("lines_fts MATCH ?")
+            params.append(match)
+            order = "lines_fts.rowid DESC"
+        else:
+            sql = "SELECT l.time, l.room, l.kind, l.username, l.text FROM lines l"
+            for term in terms:
+                conditions.append("l.text LIKE ? ESCAPE '\\'")
+                escaped = term.rstrip("*").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escaped}%")
+            order = "l.id DESC"
+        if room is not None:
+            conditions.append("l.room = ?")
+            params.append(room)
+        if username:
+            username = username.lower()
+            conditions.append("(lower(l.username) = ? OR substr(lower(l.username), 1, ?) = ?)")
+            params.extend([username, len(username) + 1, username + "@"])
+        if viewer is not None:
+            conditions.append("(l.kind = 'public' OR lower(l.username) = ?)")
+            params.append(viewer.lower())
+        sql += " WHERE " + " AND ".join(conditions) + f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        with self.read_lock:
+            try:
+                rows = self.reader.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.error("Transcript search for %r failed: %s", query, e)
+                return []
+        return [TranscriptLine(*row) for row in rows]
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=10):
+        """Write queued lines and stop the writer thread."""
+        if self.thread is not None:
+            self.items.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+        if self.reader is not None:
+            with self.read_lock:
+                self.reader.close()
+                self.reader = None
+
+    def _run(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; a crash loses at most the last batch
+        drain_in_batches(self.items, self.batch_size, self.flush_interval, lambda batch: self._write(connection, batch))
+        connection.close()
+
+    def _write(self, connection, batch):
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO lines (time, room, kind, username, text) VALUES (?, ?, ?, ?, ?)", batch
+                )
+        except sqlite3.Error as e:
+            logger.error("Could not write %d line(s) to %s: %s", len(batch), self.path, e)
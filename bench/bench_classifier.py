@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for the teleconference line classifier.
+
+Usage: python bench/bench_classifier.py [logfile] [--repeat N]
+
+Reports lines/sec for bbsbot.classifier.classify over a captured teleconference
+log, next to the old per-line regex chain it replaced, so regressions show up.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbsbot.classifier import classify  # noqa: E402
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "teleconference.log")
+
+
+def legacy_classify(line):
+    """The pre-classifier parse: recompile, strip, then try each pattern in turn."""
+    ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
+    clean_line = ansi_escape_regex.sub('', line)
+    for kind, pattern in (
+        ("whisper", r'From (.+?) \(whispered\): (.+)'),
+        ("page", r'(.+?) is paging you from (.+?): (.+)'),
+        ("direct", r'From (.+?) \(to you\): (.+)'),
+        ("public", r'From (.+?): (.+)'),
+        ("joined", r'(.+?) just joined this channel!'),
+        ("online", r'(.+?)@(.+?) \(.*?\) is now online\.  Total users: \d+\.'),
+    ):
+        match = re.match(pattern, clean_line)
+        if match:
+            return kind, clean_line, match.groups()
+    if re.search(r'(is|are) here with you\.$', line.strip()):
+        return "here", clean_line, ()
+    lower = clean_line.lower()
+    for prompt in ('please finish up and log off.', 'otherwise type "new": ', 'enter your password: ',
+                   '(n)onstop, (q)uit, or (c)ontinue?'):
+        if prompt in lower:
+            return "prompt", clean_line, ()
+    return "other", clean_line, ()
+
+
+def run(func, lines, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            func(line)
+    elapsed = time.perf_counter() - start
+    return len(lines) * repeat / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("logfile", nargs="?", default=DEFAULT_LOG)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.logfile, "r", encoding="utf-8", errors="replace") as file:
+        lines = file.read().splitlines()
+
+    print(f"{len(lines)} lines x {args.repeat} repeats from {args.logfile}")
+    for name, func in (("classifier", classify), ("legacy", legacy_classify)):
+        print(f"{name:>10}: {run(func, lines, args.repeat):,.0f} lines/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Throughput benchmark for the telnet stream framer.
+
+Usage: python bench/bench_framer.py [logfile] [--repeat N] [--read-size BYTES]
+
+Replays a captured teleconference log as CRLF-terminated telnet reads and
+reports MB/sec and lines/sec for bbsbot.framer.LineFramer next to the old
+accumulate-and-split loop it replaced (which stripped ANSI for the parser and
+then parsed it again for the display). A second run feeds an ANSI-art screen
+that sends no newline until its last byte, where the old loop is quadratic.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbsbot.classifier import ANSI_ESCAPE  # noqa: E402
+from bbsbot.framer import LineFramer  # noqa: E402
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "teleconference.log")
+
+
+def legacy_display_segments(text):
+    """The display's own ANSI pass (foreground only), as the Tk front end did it per line."""
+    segments = []
+    last_end = 0
+    current = None
+    for match in ANSI_ESCAPE.finditer(text):
+        start, end = match.span()
+        if start > last_end:
+            segments.append((text[last_end:start], current))
+        codes = match.group(1).split(';')
+        if '0' in codes:
+            current = None
+        for code in codes:
+            if code.startswith(('3', '9')):
+                current = code
+        last_end = end
+    if last_end < len(text):
+        segments.append((text[last_end:], current))
+    return segments
+
+
+def legacy_frame(reads):
+    """The pre-framer loop: append to a string, re-split it on every read, strip ANSI twice per line."""
+    partial_line = ""
+    count = 0
+    for data in reads:
+        data = data.decode("cp437").replace('\r\n', '\n').replace('\r', '\n')
+        partial_line += data
+        lines = partial_line.split("\n")
+        for line in lines[:-1]:
+            ANSI_ESCAPE.sub('', line)
+            legacy_display_segments(line)
+            count += 1
+        partial_line = lines[-1]
+    return count
+
+
+def framer_frame(reads):
+    framer = LineFramer()
+    count = 0
+    for data in reads:
+        count += len(framer.feed(data))
+    return count
+
+
+def ansi_art_screen(size):
+    """A full-screen ANSI drawing: colour changes and cursor moves, one newline at the end."""
+    cell = "\x1b[1;3{}m\x1b[{};{}H\u2588\u2588\u2592\u2591"
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        part = cell.format(i % 8, i % 24 + 1, i % 80 + 1)
+        parts.append(part)
+        length += len(part)
+        i += 1
+    return ("".join(parts) + "\r\n").encode("cp437")
+
+
+def split_reads(stream, read_size):
+    return [stream[i:i + read_size] for i in range(0, len(stream), read_size)]
+
+
+def run(func, reads, repeat):
+    size = sum(len(data) for data in reads)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        lines = func(reads)
+    elapsed = time.perf_counter() - start
+    return size * repeat / elapsed / 1e6, lines * repeat / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("logfile", nargs="?", default=DEFAULT_LOG)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--read-size", type=int, default=4096, help="bytes per simulated telnet read")
+    parser.add_argument("--art-size", type=int, default=1 << 20, help="bytes in the newline-free ANSI screen")
+    args = parser.parse_args()
+
+    with open(args.logfile, "r", encoding="utf-8", errors="replace") as file:
+        log = file.read().replace("\n", "\r\n").encode("cp437", errors="replace")
+
+    workloads = (
+        ("teleconference", split_reads(log * 20, args.read_size), args.repeat),
+        ("ansi art", split_reads(ansi_art_screen(args.art_size), args.read_size), 1),
+    )
+    for title, reads, repeat in workloads:
+        size = sum(len(data) for data in reads)
+        print(f"{title}: {size:,} bytes in {len(reads)} reads x {repeat} repeats")
+        for name, func in (("framer", framer_frame), ("legacy", legacy_frame)):
+            mb_per_sec, lines_per_sec = run(func, reads, repeat)
+            print(f"{name:>10}: {mb_per_sec:8.1f} MB/sec {lines_per_sec:12,.0f} lines/sec")
+
+
+if __name__ == "__main__":
+    main()
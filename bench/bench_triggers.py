@@ -0,0 +1,270 @@
+"""
+Trigger-storm benchmark: the whole bot against a simulated room and mock APIs.
+
+Usage: python bench/bench_triggers.py [--duration 30] [--rate 5] [--chatter 20] [--users 40]
+                                      [--latency 50] [--error-rate 0] [--provider-latency NAME=MS ...]
+                                      [--send-rate LINES] [--json FILE] [--max-p95 MS]
+
+A helper process runs bench/simulator.py's teleconference and the
+bench/mock_apis.py server. This process runs a real BotCore from a scratch
+working directory whose settings.json and api_keys.json point every API
+(OpenAI, OpenWeather, YouTube, Google CSE and Places, NewsAPI, Pexels,
+Giphy, Alpha Vantage, CoinMarketCap, iTunes, DynamoDB) at the mocks, so
+nothing leaves the machine and the bot's own files are left alone. The
+script fires every provider's trigger in turn, with "{n}" in the queries so
+each one misses the response cache.
+
+Reported: lines parsed per second (observed, and the capacity implied by
+the time spent in process_data_chunk), p50/p95/p99 trigger-to-first-reply
+latency as seen by the simulated users, outbound lines per second, mock API
+calls and this process's peak RSS. Replies are paced by the outbound queue
+(send_lines_per_second), so with multi-line replies the latency mostly
+measures that queue; --send-rate overrides it for the run. --max-p95 exits
+with status 1 when p95 latency is over the limit, for use in CI.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from mock_apis import MockAPIServer, add_arguments, api_endpoints, parse_provider_latency  # noqa: E402
+from simulator import Simulator, percentile  # noqa: E402
+
+# Multi-line replies go to whispers and pages, which are paired with their
+# trigger per user; public replies share one queue, so only one-line ones go there.
+STORM_SCRIPT = [
+    ("whisper", "!weather current {n}ville va"),
+    ("page", "!weather forecast {n}ville tx"),
+    ("whisper", "!yt retro computing {n}"),
+    ("page", "!search bulletin board {n}"),
+    ("whisper", "!map tower {n}"),
+    ("page", "!news bbs {n}"),
+    ("public", "!pic sunset {n}"),
+    ("whisper", "!gif dancing cat {n}"),
+    ("public", "!stocks T{n}"),
+    ("whisper", "!crypto C{n}"),
+    ("page", "!pod retro{n} 12"),
+    ("whisper", "!chat what door game should I play tonight {n}"),
+    ("direct", "what's going on in here {n}"),
+    ("public", "!seen {user}"),
+]
+
+BOT_NAME = "Ultron"
+JOIN_TIMEOUT = 60
+
+
+def run_harness(conn, options):
+    """Helper process: mock APIs plus the simulated teleconference."""
+    mock = MockAPIServer(
+        latency=options["latency"], error_rate=options["error_rate"], provider_latency=options["provider_latency"]
+    ).start()
+    try:
+        asyncio.run(drive_simulator(conn, mock, options))
+    finally:
+        mock.stop()
+
+
+async def drive_simulator(conn, mock, options):
+    simulator = Simulator(options["users"], options["rate"], options["chatter"], STORM_SCRIPT, bulletins=1)
+    server = await simulator.start("127.0.0.1", 0)
+    conn.send({"sim_port": server.sockets[0].getsockname()[1], "mock_url": mock.url})
+    try:
+        await asyncio.wait_for(simulator.joined.wait(), JOIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        conn.send({"error": f"the bot did not join the teleconference within {JOIN_TIMEOUT}s"})
+        await simulator.stop()
+        return
+    conn.send({"joined": True})
+
+    await asyncio.sleep(options["duration"])
+    for task in simulator.tasks:
+        task.cancel()
+    traffic_seconds = time.perf_counter() - simulator.stats.started
+    await asyncio.sleep(options["drain"])
+
+    stats = simulator.stats
+    conn.send({
+        "traffic_seconds": traffic_seconds,
+        "total_seconds": time.perf_counter() - stats.started,
+        "triggers": stats.triggers,
+        "unanswered": stats.unanswered(),
+        "latencies": sorted(stats.latencies),
+        "room_lines": stats.room_lines,
+        "reply_lines": stats.reply_lines,
+        "api_requests": dict(mock.requests),
+    })
+    await simulator.stop()
+
+
+class CountingFrontend:
+    """Discards output but counts the lines the framer completed."""
+
+    def __init__(self):
+        self.lines = 0
+
+    def show_text(self, text):
+        pass
+
+    def show_lines(self, lines):
+        self.lines += len(lines)
+
+    def connection_changed(self, connected):
+        pass
+
+
+def prepare_workdir(mock_url):
+    """Scratch directory with settings and dummy keys pointing at the mocks."""
+    workdir = tempfile.mkdtemp(prefix="bbsbot-bench-")
+    settings = {"api_endpoints": api_endpoints(mock_url), "openai_api_base": mock_url + "/v1"}
+    keys = {name: "bench" for name in (
+        "openai_api_key", "weather_api_key", "youtube_api_key", "google_cse_api_key", "google_cse_cx",
+        "news_api_key", "google_places_api_key", "pexels_api_key", "alpha_vantage_api_key",
+        "coinmarketcap_api_key", "giphy_api_key",
+    )}
+    for filename, content in (("settings.json", settings), ("api_keys.json", keys),
+                              ("username.json", BOT_NAME), ("password.json", "bench")):
+        with open(os.path.join(workdir, filename), "w") as file:
+            json.dump(content, file)
+    return workdir
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20) if sys.platform == "darwin" else peak / 1024, 1)  # bytes on macOS, KiB elsewhere
+
+
+def run_bot(conn, ready, args):
+    """Start the bot against the helper process; return the metrics dict."""
+    os.environ["AWS_ENDPOINT_URL_DYNAMODB"] = ready["mock_url"]
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.chdir(prepare_workdir(ready["mock_url"]))
+
+    from bbsbot.core import BotCore  # after the environment and working directory are set
+
+    core = BotCore(name="bench")
+    frontend = CountingFrontend()
+    core.frontend = frontend
+    core.host.set("127.0.0.1")
+    core.port.set(ready["sim_port"])
+    core.auto_login_enabled.set(True)
+    if args.send_rate:
+        core.outbound.interval = 1.0 / args.send_rate
+
+    parse_time = [0.0]
+    process_data_chunk = core.process_data_chunk
+
+    def timed_process_data_chunk(data):
+        start = time.perf_counter()
+        process_data_chunk(data)
+        parse_time[0] += time.perf_counter() - start
+
+    core.process_data_chunk = timed_process_data_chunk
+
+    core.start()
+    core.start_connection()
+    try:
+        message = conn.recv()
+        if "error" in message:
+            raise SystemExit(message["error"])
+        lines_before, parse_before = frontend.lines, parse_time[0]
+        result = conn.recv()
+        lines = frontend.lines - lines_before
+        busy = parse_time[0] - parse_before
+    finally:
+        core.shutdown()
+
+    latencies = result["latencies"]
+    return {
+        "duration_s": round(result["traffic_seconds"], 2),
+        "triggers": result["triggers"],
+        "answered": len(latencies),
+        "unanswered": result["unanswered"],
+        "latency_ms": {
+            name: round(percentile(latencies, q) * 1000, 1) if latencies else None
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+        "lines_parsed": lines,
+        "parsed_lines_per_s": round(lines / result["total_seconds"], 1),
+        "parse_capacity_lines_per_s": round(lines / busy) if busy else None,
+        "outbound_lines": result["reply_lines"],
+        "outbound_lines_per_s": round(result["reply_lines"] / result["total_seconds"], 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "api_requests": result["api_requests"],
+    }
+
+
+def report(metrics):
+    latency = metrics["latency_ms"]
+    print(f"{metrics['triggers']} triggers over {metrics['duration_s']}s: "
+          f"{metrics['answered']} answered, {metrics['unanswered']} unanswered")
+    if latency["p50"] is not None:
+        print("trigger-to-first-reply ms: p50 {p50}  p95 {p95}  p99 {p99}  max {max}".format(**latency))
+    capacity = metrics["parse_capacity_lines_per_s"]
+    print(f"parsed: {metrics['lines_parsed']} lines, {metrics['parsed_lines_per_s']}/s"
+          + (f" (capacity {capacity:,}/s)" if capacity else ""))
+    print(f"outbound: {metrics['outbound_lines']} lines, {metrics['outbound_lines_per_s']}/s")
+    if metrics["peak_rss_mb"] is not None:
+        print(f"peak RSS: {metrics['peak_rss_mb']} MB")
+    calls = ", ".join(f"{name} {count}" for name, count in sorted(metrics["api_requests"].items()))
+    print(f"mock API calls: {calls or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--drain", type=float, default=10, help="seconds to wait for replies after traffic stops")
+    parser.add_argument("--rate", type=float, default=5.0, help="triggers per second")
+    parser.add_argument("--chatter", type=float, default=20.0, help="non-trigger room lines per second")
+    parser.add_argument("--users", type=int, default=40, help="virtual users in the room")
+    parser.add_argument("--send-rate", type=float, help="override the bot's outbound lines per second")
+    parser.add_argument("--json", help="also write the metrics to this file")
+    parser.add_argument("--max-p95", type=float, help="exit with status 1 if p95 latency exceeds this many ms")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.json:
+        args.json = os.path.abspath(args.json)  # the bot runs from a scratch directory
+
+    options = {
+        "duration": args.duration, "drain": args.drain, "rate": args.rate, "chatter": args.chatter,
+        "users": args.users, "latency": args.latency / 1000, "error_rate": args.error_rate,
+        "provider_latency": parse_provider_latency(args.provider_latency),
+    }
+    conn, child_conn = multiprocessing.Pipe()
+    harness = multiprocessing.Process(target=run_harness, args=(child_conn, options), daemon=True)
+    harness.start()
+    try:
+        ready = conn.recv()
+        metrics = run_bot(conn, ready, args)
+    finally:
+        harness.join(5)
+        if harness.is_alive():
+            harness.terminate()
+
+    report(metrics)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(metrics, file, indent=2)
+    p95 = metrics["latency_ms"]["p95"]
+    if args.max_p95 is not None and (p95 is None or p95 > args.max_p95):
+        print(f"FAIL: p95 latency {p95} ms is over the {args.max_p95} ms limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Mock servers for the external APIs the bot calls, for offline benchmarks.
+
+Usage: python bench/mock_apis.py [--port 8099] [--latency 50] [--error-rate 0]
+                                 [--provider-latency NAME=MS ...]
+
+One HTTP server answers for every provider, telling them apart by path:
+OpenAI chat completions (streamed as server-sent events or as one JSON
+body), OpenWeather, YouTube, Google Custom Search, Google Places, NewsAPI,
+Pexels, Giphy (search and the GIF page), Alpha Vantage, CoinMarketCap,
+iTunes and the DynamoDB JSON protocol. Each reply waits for the provider's
+latency (a streamed completion spreads it over its chunks) and fails with a
+503 at the configured error rate.
+
+Point the bot at it with the "api_endpoints" and "openai_api_base" entries
+printed at startup (copy them into settings.json) and, for DynamoDB,
+AWS_ENDPOINT_URL_DYNAMODB.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Real API origins, rewritten to the mock by bbsbot.httpclient.HTTPClient(endpoints=...)
+API_ORIGINS = [
+    "http://api.openweathermap.org",
+    "https://www.googleapis.com",
+    "https://places.googleapis.com",
+    "https://newsapi.org",
+    "https://api.pexels.com",
+    "https://api.giphy.com",
+    "https://www.alphavantage.co",
+    "https://pro-api.coinmarketcap.com",
+    "https://itunes.apple.com",
+]
+
+PROVIDERS = [
+    "openai", "openweather", "youtube", "google_cse", "google_places", "newsapi",
+    "pexels", "giphy", "alphavantage", "coinmarketcap", "itunes", "dynamodb",
+]
+
+CHAT_REPLY = "Hey :) Not much, just hanging out in the teleconference. Try the trade wars door, it never gets old."
+
+
+def api_endpoints(url):
+    """settings.json "api_endpoints" value that sends every API call to the mock at url."""
+    return {origin: url for origin in API_ORIGINS}
+
+
+def first(query, name, default=""):
+    return query.get(name, [default])[0]
+
+
+def openweather(request):
+    if request.path.endswith("/forecast"):
+        now = int(time.time())
+        days = [
+            {"dt": now + 86400 * day, "main": {"temp": 60.0 + day}, "weather": [{"description": "scattered clouds"}]}
+            for day in range(1, 5)
+        ]
+        return {"cod": "200", "list": days}
+    return {
+        "cod": 200,
+        "weather": [{"description": "clear sky"}],
+        "main": {"temp": 61.2, "feels_like": 60.1, "humidity": 71},
+        "wind": {"speed": 5.7},
+    }
+
+
+def youtube(request):
+    query = first(request.query, "q")
+    return {"items": [{"id": {"videoId": "dQw4w9WgXcQ"}, "snippet": {"title": f"{query} (official video)"}}]}
+
+
+def google_cse(request):
+    query = first(request.query, "q")
+    return {"items": [{
+        "title": f"{query} - Wikipedia",
+        "snippet": f"All about {query}.",
+        "link": "https://en.wikipedia.org/wiki/Bulletin_board_system",
+    }]}
+
+
+def google_places(request):
+    place = request.json().get("textQuery", "")
+    return {"places": [{
+        "displayName": {"text": place.title()},
+        "formattedAddress": "350 5th Ave, New York, NY 10118, USA",
+        "types": ["tourist_attraction", "point_of_interest"],
+        "websiteUri": "https://www.esbnyc.com/",
+    }]}
+
+
+def newsapi(request):
+    topic = first(request.query, "q")
+    return {"articles": [
+        {"title": f"{topic} makes a comeback", "description": f"Fans of {topic} gather online. " * 4,
+         "url": "https://news.example.com/1"},
+        {"title": f"The history of {topic}", "description": "A look back at dial-up days. " * 4,
+         "url": "https://news.example.com/2"},
+    ]}
+
+
+def pexels(request):
+    return {"photos": [{"src": {"original": "https://images.pexels.com/photos/1/pexels-photo-1.jpeg"}}]}
+
+
+def giphy(request):
+    if request.path.startswith("/gifs/"):
+        return ("text/html", '<html><head><meta property="og:image" '
+                'content="https://media.giphy.com/media/abc123/giphy.webp"></head></html>')
+    return {"data": [{"url": f"{request.base}/gifs/abc123"}]}
+
+
+def alphavantage(request):
+    return {"Global Quote": {"01. symbol": first(request.query, "symbol"), "05. price": "123.4500"}}
+
+
+def coinmarketcap(request):
+    symbol = first(request.query, "symbol")
+    return {"data": {symbol: {"quote": {"USD": {"price": 42000.1234}}}}}
+
+
+def itunes(request):
+    term = first(request.query, "term")
+    episode = term.split()[-1] if term else "1"
+    return {"resultCount": 1, "results": [{
+        "trackName": f"Episode {episode}: Mock Show",
+        "description": f"episode {episode} of the mock show",
+        "releaseDate": "2024-01-01T08:00:00Z",
+        "previewUrl": "https://podcasts.example.com/preview.mp3",
+    }]}
+
+
+def dynamodb(request):
+    operation = request.headers.get("X-Amz-Target", "").rpartition(".")[2]
+    body = request.json()
+    if operation in ("DescribeTable", "CreateTable"):
+        return {"Table": {"TableName": body.get("TableName"), "TableStatus": "ACTIVE", "ItemCount": 0}}
+    if operation in ("Query", "Scan"):
+        return {"Items": [], "Count": 0, "ScannedCount": 0}
+    if operation == "BatchWriteItem":
+        return {"UnprocessedItems": {}}
+    return {}
+
+
+ROUTES = {
+    "/data/2.5/weather": ("openweather", openweather),
+    "/data/2.5/forecast": ("openweather", openweather),
+    "/youtube/v3/search": ("youtube", youtube),
+    "/customsearch/v1": ("google_cse", google_cse),
+    "/v1/places:searchText": ("google_places", google_places),
+    "/v2/everything": ("newsapi", newsapi),
+    "/v1/search": ("pexels", pexels),
+    "/v1/gifs/search": ("giphy", giphy),
+    "/query": ("alphavantage", alphavantage),
+    "/v1/cryptocurrency/quotes/latest": ("coinmarketcap", coinmarketcap),
+    "/search": ("itunes", itunes),
+}
+
+
+class MockRequest:
+    def __init__(self, handler, body):
+        url = urlsplit(handler.path)
+        self.method = handler.command
+        self.path = url.path
+        self.query = parse_qs(url.query)
+        self.headers = handler.headers
+        self.body = body
+        self.base = handler.server.url
+
+    def json(self):
+        return json.loads(self.body or b"{}")
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def handle_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = MockRequest(self, self.rfile.read(length) if length else b"")
+        if request.path == "/v1/chat/completions":
+            provider, handler = "openai", None
+        elif request.path.startswith("/gifs/"):
+            provider, handler = "giphy", giphy
+        elif self.headers.get("X-Amz-Target", "").startswith("DynamoDB"):
+            provider, handler = "dynamodb", dynamodb
+        else:
+            provider, handler = ROUTES.get(request.path, (None, None))
+        if provider is None:
+            self.reply(404, "application/json", b'{"error": "no such mock endpoint"}')
+            return
+
+        server = self.server
+        server.count(provider)
+        latency = server.latency_for(provider)
+        if random.random() < server.error_rate:
+            server.count(provider + " errors")
+            time.sleep(latency)
+            self.reply(503, "application/json", b'{"error": "injected mock failure"}')
+        elif provider == "openai":
+            self.chat_completion(request, latency)
+        else:
+            time.sleep(latency)
+            result = handler(request)
+            if isinstance(result, tuple):
+                content_type, text = result
+                self.reply(200, content_type, text.encode("utf-8"))
+            else:
+                content_type = "application/x-amz-json-1.0" if provider == "dynamodb" else "application/json"
+                self.reply(200, content_type, json.dumps(result).encode("utf-8"))
+
+    def chat_completion(self, request, latency):
+        body = request.json()
+        words = CHAT_REPLY.split(" ")
+        base = {"id": "chatcmpl-mock", "created": int(time.time()), "model": body.get("model", "gpt-4o-mini")}
+        if not body.get("stream"):
+            time.sleep(latency)
+            result = dict(base, object="chat.completion", choices=[{
+                "index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": CHAT_REPLY},
+            }])
+            self.reply(200, "application/json", json.dumps(result).encode("utf-8"))
+            return
+
+        # Half the latency before the first token, the rest spread over the stream
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(latency / 2)
+        for i, word in enumerate(words):
+            text = word if i == 0 else " " + word
+            chunk = dict(base, object="chat.completion.chunk", choices=[{
+                "index": 0, "finish_reason": None, "delta": {"content": text},
+            }])
+            self.write_chunk(f"data: {json.dumps(chunk)}\n\n")
+            time.sleep(latency / 2 / len(words))
+        self.write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def reply(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockAPIServer(ThreadingHTTPServer):
+    """The mock server; latency is in seconds, per provider with a default."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, error_rate=0.0, provider_latency=None):
+        super().__init__((host, port), MockHandler)
+        self.url = f"http://{host}:{self.server_address[1]}"
+        self.latency = latency
+        self.error_rate = error_rate
+        self.provider_latency = dict(provider_latency or {})
+        self.requests = Counter()
+        self.requests_lock = threading.Lock()
+        self.thread = None
+
+    def latency_for(self, provider):
+        return self.provider_latency.get(provider, self.latency)
+
+    def count(self, name):
+        with self.requests_lock:
+            self.requests[name] += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def parse_provider_latency(values):
+    """["openai=800", ...] -> {"openai": 0.8, ...}"""
+    result = {}
+    for value in values or []:
+        name, _, ms = value.partition("=")
+        if name not in PROVIDERS:
+            raise SystemExit(f"Unknown provider '{name}'; choose from {', '.join(PROVIDERS)}")
+        result[name] = float(ms) / 1000
+    return result
+
+
+def add_arguments(parser):
+    parser.add_argument("--latency", type=float, default=50, help="mock API latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock API calls that fail with 503")
+    parser.add_argument("--provider-latency", action="append", metavar="NAME=MS",
+                        help="latency for one provider (" + ", ".join(PROVIDERS) + "); repeatable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = MockAPIServer(args.host, args.port, args.latency / 1000, args.error_rate,
+                           parse_provider_latency(args.provider_latency))
+    print(json.dumps({"api_endpoints": api_endpoints(server.url), "openai_api_base": server.url + "/v1"}, indent=2))
+    print(f"AWS_ENDPOINT_URL_DYNAMODB={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
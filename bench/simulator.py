@@ -0,0 +1,347 @@
+"""
+Local MajorBBS teleconference simulator for offline load and latency tests.
+
+Usage: python bench/simulator.py [--port 2323] [--users 20] [--rate 5] [--chatter 10]
+                                 [--duration 60] [--script FILE] [--bulletins 2]
+
+Point the bot at localhost:2323 (auto-login on). The server walks it through
+the logon prompts and news pager, and once it types "/go tele", virtual users
+start talking in the dialect bbsbot.classifier expects: public lines, whispers,
+pages and direct messages carrying triggers at --rate per second, background
+chatter at --chatter lines per second, and the occasional join. ENTER is
+answered with the who-list.
+
+Each trigger is timed until the next reply line addressed the same way
+("Whisper to X", "/P X", ">X", or a public line), so scripts should stick to
+commands with one-line replies. After --duration seconds (or on Ctrl+C) the
+trigger-to-reply latencies are printed.
+
+Script files hold one trigger per line, "<channel> <text>", where channel is
+public, whisper, page or direct; "{user}" is replaced by a random room member
+and "{n}" by the trigger's sequence number (to defeat the response cache).
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import deque
+
+DEFAULT_SCRIPT = [
+    "public !seen {user}",
+    "whisper !seen {user}",
+    "page !seen {user}",
+    "public !said {user}",
+    "direct !seen {user}",
+]
+
+CHATTER = ["hey all", "brb", "lol", "anyone around tonight?", "what's everyone up to", "nice", "gn all"]
+
+# Telnet: IAC WILL SGA, IAC WILL ECHO, so the client knows it is talking to a telnet server
+TELNET_GREETING = bytes([255, 251, 3, 255, 251, 1])
+IAC = 255
+SB = 250
+SE = 240
+
+LOGIN_PROMPT = 'If you already have a User-ID on this system, type it in and press ENTER.\r\nOtherwise type "new": '
+PASSWORD_PROMPT = "Enter your password: "
+PAGER_PROMPT = "(N)onstop, (Q)uit, or (C)ontinue?"
+
+REPLY_ADDRESS = re.compile(r'(?i)^(?:whisper to (\S+)|/p (\S+)|>(\S+))')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return float("nan")
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def load_script(path):
+    entries = []
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                channel, _, text = line.partition(" ")
+                entries.append((channel.lower(), text))
+    return entries
+
+
+class Stats:
+    """Trigger-to-reply latency and traffic counters across all connections."""
+
+    def __init__(self):
+        self.outstanding = {}  # (channel, user) -> deque of send times
+        self.latencies = []
+        self.triggers = 0
+        self.room_lines = 0
+        self.reply_lines = 0
+        self.started = None
+
+    def trigger_sent(self, channel, user):
+        key = ("public", None) if channel == "public" else (channel, user.lower())
+        self.outstanding.setdefault(key, deque()).append(time.perf_counter())
+        self.triggers += 1
+
+    def reply_received(self, line):
+        self.reply_lines += 1
+        match = REPLY_ADDRESS.match(line)
+        if match is None:
+            key = ("public", None)
+        else:
+            channel = "whisper" if match.group(1) else "page" if match.group(2) else "direct"
+            key = (channel, next(group for group in match.groups() if group).lower())
+        sent = self.outstanding.get(key)
+        if sent:
+            self.latencies.append(time.perf_counter() - sent.popleft())
+
+    def unanswered(self):
+        return sum(len(sent) for sent in self.outstanding.values())
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        latencies = sorted(self.latencies)
+        lines = [
+            f"{self.triggers} triggers, {len(latencies)} answered, {self.unanswered()} unanswered"
+            f" over {elapsed:.1f}s; {self.room_lines} room lines sent"
+            f" ({self.room_lines / elapsed if elapsed else 0:.1f}/s), {self.reply_lines} bot lines received",
+        ]
+        if latencies:
+            lines.append(
+                "latency ms: p50 {:.1f}  p95 {:.1f}  p99 {:.1f}  max {:.1f}".format(
+                    *(percentile(latencies, q) * 1000 for q in (0.5, 0.95, 0.99)), latencies[-1] * 1000
+                )
+            )
+        return "\n".join(lines)
+
+
+class TeleconferenceSession:
+    """One connected client: the logon dialogue, then the teleconference."""
+
+    def __init__(self, simulator, reader, writer):
+        self.sim = simulator
+        self.reader = reader
+        self.writer = writer
+        self.buffer = bytearray()
+        self.skip_lf = False  # the last line ended in a CR at the end of a read
+        self.in_tele = False
+
+    def send(self, text):
+        self.writer.write(text.encode("cp437", errors="replace"))
+
+    async def read_line(self):
+        """Next line typed by the client, with telnet commands removed."""
+        while True:
+            if self.skip_lf and self.buffer:
+                # A CR LF split across reads leaves an LF behind; it ends no line of its own
+                if self.buffer[:1] == b"\n":
+                    del self.buffer[:1]
+                self.skip_lf = False
+            match = re.search(rb'\r\n?|\n', self.buffer)
+            if match:
+                line = bytes(self.buffer[:match.start()])
+                del self.buffer[:match.end()]
+                self.skip_lf = match.group() == b"\r" and not self.buffer
+                return line.decode("cp437", errors="replace")
+            data = await self.reader.read(4096)
+            if not data:
+                raise ConnectionResetError("client closed the connection")
+            self.buffer.extend(strip_telnet(data))
+
+    async def run(self):
+        self.writer.write(TELNET_GREETING)
+        self.send("Welcome to the simulated MajorBBS!\r\n\r\n")
+        while True:
+            self.send(LOGIN_PROMPT)
+            username = (await self.read_line()).strip() or "Ultron"
+            self.send("\r\n" + PASSWORD_PROMPT)
+            password = (await self.read_line()).strip()
+            # Like a real board, a repeated username typed at the password prompt is a wrong password
+            if password and password.lower() != username.lower():
+                break
+            self.send("\r\nSorry, that is not the correct password.\r\n\r\n")
+        for page in range(self.sim.bulletins):
+            self.send(f"\r\n\x1b[1;33mSystem bulletin {page + 1}\x1b[0m\r\n" + "News of the day.\r\n" * 20 + PAGER_PROMPT)
+            await self.read_line()
+        self.send(f"\r\nGreetings, {username}, glad to see you back again.\r\n\r\nMain menu\r\nMake your selection: ")
+
+        while True:
+            line = (await self.read_line()).strip()
+            if self.in_tele:
+                self.handle_tele_line(line)
+            elif line.lower() == "/go tele":
+                self.in_tele = True
+                self.sim.session_joined(self)
+                self.send("\r\n\x1b[1;36m:***\x1b[0m\r\n")
+                self.send_who_list()
+            elif line:
+                self.send("\r\nMake your selection: ")
+
+    def handle_tele_line(self, line):
+        if not line:
+            self.send_who_list()
+        else:
+            self.sim.stats.reply_received(line)
+
+    def send_who_list(self):
+        users = self.sim.users
+        listed = [f"{user}@{self.sim.user_hosts[user]}" for user in users[:-1]]
+        who = ", ".join(listed) + f" and {users[-1]}" if listed else users[-1]
+        verb = "are" if listed else "is"
+        self.send(f"\x1b[1;37mTopic: (General chat).  {who} {verb} here with you.\x1b[0m\r\n")
+
+
+def strip_telnet(data):
+    """Drop telnet commands (IAC sequences and subnegotiations) from client input."""
+    if IAC not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte != IAC:
+            out.append(byte)
+            i += 1
+        elif i + 1 < len(data) and data[i + 1] == IAC:
+            out.append(IAC)
+            i += 2
+        elif i + 1 < len(data) and data[i + 1] == SB:
+            end = data.find(bytes([IAC, SE]), i + 2)
+            i = len(data) if end < 0 else end + 2
+        elif i + 1 < len(data) and 251 <= data[i + 1] <= 254:
+            i += 3  # WILL/WONT/DO/DONT <option>
+        else:
+            i += 2
+    return bytes(out)
+
+
+class Simulator:
+    """The server plus the virtual users that drive traffic into every joined session."""
+
+    def __init__(self, users=20, rate=5.0, chatter=10.0, script=None, bulletins=2, join_every=30.0):
+        self.users = [f"User{i:02d}" for i in range(users)]
+        self.user_hosts = {user: f"bbs{i % 4}.example.net" for i, user in enumerate(self.users)}
+        self.rate = rate
+        self.chatter = chatter
+        self.script = script or [tuple(entry.split(" ", 1)) for entry in DEFAULT_SCRIPT]
+        self.bulletins = bulletins
+        self.join_every = join_every
+        self.sessions = []
+        self.stats = Stats()
+        self.joined = asyncio.Event()
+        self.tasks = []
+
+    async def start(self, host="127.0.0.1", port=2323):
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def handle_client(self, reader, writer):
+        session = TeleconferenceSession(self, reader, writer)
+        try:
+            await session.run()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            if session in self.sessions:
+                self.sessions.remove(session)
+            writer.close()
+
+    def session_joined(self, session):
+        self.sessions.append(session)
+        if not self.joined.is_set():
+            self.joined.set()
+            self.stats.started = time.perf_counter()
+            self.tasks = [
+                asyncio.ensure_future(self.drive(self.rate, self.fire_trigger)),
+                asyncio.ensure_future(self.drive(self.chatter, self.say_chatter)),
+                asyncio.ensure_future(self.drive(1.0 / self.join_every if self.join_every else 0, self.announce_join)),
+            ]
+
+    async def drive(self, rate, action):
+        """Call action() rate times per second (Poisson arrivals)."""
+        if rate <= 0:
+            return
+        while True:
+            await asyncio.sleep(random.expovariate(rate))
+            action()
+
+    def broadcast(self, text):
+        self.stats.room_lines += 1
+        for session in self.sessions:
+            session.send(text)
+
+    def fire_trigger(self):
+        channel, text = self.script[self.stats.triggers % len(self.script)]
+        user = random.choice(self.users)
+        text = text.replace("{user}", random.choice(self.users)).replace("{n}", str(self.stats.triggers))
+        if channel == "whisper":
+            line = f"\x1b[1;35mFrom {user} (whispered): {text}\x1b[0m\r\n"
+        elif channel == "page":
+            line = f"{user} is paging you from Teleconference: {text}\r\n"
+        elif channel == "direct":
+            line = f"\x1b[1;31mFrom {user} (to you): {text}\x1b[0m\r\n"
+        else:
+            channel = "public"
+            line = f"\x1b[1;32mFrom {user}:\x1b[0m {text}\r\n"
+        self.stats.trigger_sent(channel, user)
+        self.broadcast(line)
+
+    def say_chatter(self):
+        self.broadcast(f"\x1b[1;32mFrom {random.choice(self.users)}:\x1b[0m {random.choice(CHATTER)}\r\n")
+
+    def announce_join(self):
+        user = random.choice(self.users)
+        self.broadcast(f"\x1b[1;36m:***\x1b[0m\r\n\x1b[1;33m{user}@{self.user_hosts[user]} just joined this channel!\x1b[0m\r\n")
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.server.close()
+        for session in list(self.sessions):
+            session.writer.close()  # ends each handle_client with a clean EOF
+        await self.server.wait_closed()
+        await asyncio.sleep(0.1)
+
+
+async def serve(args):
+    script = load_script(args.script) if args.script else None
+    simulator = Simulator(args.users, args.rate, args.chatter, script, args.bulletins)
+    await simulator.start(args.host, args.port)
+    print(f"Simulated teleconference on {args.host}:{args.port}; waiting for the bot to join...")
+    try:
+        await simulator.joined.wait()
+        print("Bot joined the teleconference; traffic started.")
+        if args.duration:
+            await asyncio.sleep(args.duration)
+            for task in simulator.tasks:
+                task.cancel()
+            await asyncio.sleep(args.drain)  # let the last replies arrive
+        else:
+            await asyncio.Event().wait()
+    finally:
+        print(simulator.stats.report())
+        await simulator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2323)
+    parser.add_argument("--users", type=int, default=20, help="virtual users in the room")
+    parser.add_argument("--rate", type=float, default=5.0, help="triggers per second")
+    parser.add_argument("--chatter", type=float, default=10.0, help="non-trigger room lines per second")
+    parser.add_argument("--duration", type=float, default=0, help="seconds of traffic; 0 runs until Ctrl+C")
+    parser.add_argument("--drain", type=float, default=5.0, help="seconds to wait for replies after traffic stops")
+    parser.add_argument("--script", help="trigger script file (see module docstring)")
+    parser.add_argument("--bulletins", type=int, default=2, help="pager pages shown after logon")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import queue
+
+from bbsbot.batching import drain_in_batches
+
+
+def test_batches_are_capped_and_drained_before_stopping():
+    items = queue.Queue()
+    for number in range(7):
+        items.put(number)
+    items.put(None)
+    batches = []
+    drain_in_batches(items, 3, 0.01, batches.append)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
@@ -0,0 +1,24 @@
+from bbsbot.classifier import classify, parse_who_list
+
+
+def test_kinds_and_fields():
+    assert classify("\x1b[32mFrom Bob (whispered): hi there\x1b[0m")[::2] == ("whisper", ("Bob", "hi there"))
+    assert classify("From Bob (to you): hi")[::2] == ("direct", ("Bob", "hi"))
+    assert classify("From Bob: !weather Norfolk")[::2] == ("public", ("Bob", "!weather Norfolk"))
+    assert classify("Bob is paging you from Teleconference: psst")[::2] == ("page", ("Bob", "Teleconference", "psst"))
+    assert classify("bob@x.net (Bob) is now online.  Total users: 12.")[::2] == ("online", ("bob", "x.net"))
+    assert classify("Bob@x.net just joined this channel!")[::2] == ("joined", ("Bob", "x.net"))
+    assert classify("Bob just left this channel!")[::2] == ("left", ("Bob", None))
+    assert classify("Topic: (General).  a@x.com and Bob are here with you.").kind == "topic"
+    assert classify("Bob is here with you.").kind == "here"
+    assert classify(":***").kind == "separator"
+    assert classify("-> Bob waves")[::2] == ("entrance", ("Bob waves",))
+    assert classify("Just some text").kind == "other"
+
+
+def test_whisper_wins_over_public():
+    assert classify("From Bob (whispered): From Al: hi").kind == "whisper"
+
+
+def test_who_list():
+    assert parse_who_list("a@x.com, b@y.net and Carl are here with you.") == ["a", "b", "Carl"]
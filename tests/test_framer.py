@@ -0,0 +1,27 @@
+import random
+
+from bbsbot.framer import LineFramer
+
+STREAM = (
+    b"\x1b[1;32mWelcome\x1b[0m\r\n\r\nFrom Bob: hi\r\r\n\n\nline\rnext\n\r\n"
+    b"\x1b[33mFrom Al (whispered): yo\x1b[0m\r\n\r\r\n:***\r\n" * 4
+)
+
+
+def frame(reads):
+    framer = LineFramer()
+    return [line.raw for data in reads for line in framer.feed(data)]
+
+
+def test_cr_then_lone_lf_read_keeps_next_blank_line():
+    # "\r" ends one read and "\n" is the whole next one; the blank line after it must survive
+    assert frame([b"a\r", b"\n", b"\n", b"b\n"]) == ["a", "", "b"]
+
+
+def test_any_read_boundaries_give_the_same_lines():
+    expected = frame([STREAM])
+    rng = random.Random(14)
+    for _ in range(2000):
+        cuts = sorted(rng.sample(range(1, len(STREAM)), rng.randint(1, 12)))
+        reads = [STREAM[start:end] for start, end in zip([0] + cuts, cuts + [len(STREAM)])]
+        assert frame(reads) == expected, reads
@@ -0,0 +1,40 @@
+import json
+import os
+
+from bbsbot.history import PublicHistory
+
+
+def test_ring_keeps_newest_lines_in_order(tmp_path):
+    history = PublicHistory(str(tmp_path / "history.json"), capacity=3)
+    for number, username in enumerate(["a", "b", "a", "c", "b"]):
+        history.add(username, str(number), 1000 + number)
+    assert [m.text for m in history.recent(10)] == ["2", "3", "4"]
+    assert [m.text for m in history.recent(10, "b")] == ["4"]
+    assert "a" in history.by_user and history.recent(10, "a")[0].text == "2"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "history.json")
+    history = PublicHistory(path)
+    history.add("Bob", "hello", 1000)
+    history.add("Al", "yo", 1001)
+    history.save()
+    loaded = PublicHistory(path)
+    loaded.load()
+    assert [(m.time, m.username, m.text) for m in loaded.recent(10)] == [(1000, "Bob", "hello"), (1001, "Al", "yo")]
+
+
+def test_legacy_per_user_file_is_migrated(tmp_path):
+    path = str(tmp_path / "public_message_history.json")
+    with open(path, "w") as file:
+        json.dump({"noah": ["!yt", "helo"], "ultron": ["Hey!"]}, file)
+    os.utime(path, (5000, 5000))
+    history = PublicHistory(path)
+    history.load()
+    assert [(m.time, m.username, m.text) for m in history.recent(10)] == [
+        (5000, "noah", "!yt"), (5000, "noah", "helo"), (5000, "ultron", "Hey!")
+    ]
+    assert [m.text for m in history.recent(10, "noah")] == ["!yt", "helo"]
+    history.save()
+    with open(path) as file:
+        assert json.load(file)["messages"] == [[5000, "noah", "!yt"], [5000, "noah", "helo"], [5000, "ultron", "Hey!"]]
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from bbsbot.keepalive import IAC_NOP, send_keepalive
+
+
+class FakeWriter:
+    """Records telnet commands; remote_option shows what the server negotiated."""
+
+    def __init__(self, negotiated=True):
+        self.remote_option = {1: True} if negotiated else {}
+        self.iac = []
+
+    def send_iac(self, data):
+        self.iac.append(data)
+
+
+@pytest.mark.parametrize("mode, negotiated, expected", [
+    ("nop", True, "nop"),
+    ("nop", False, "nop"),
+    ("auto", True, "nop"),
+    ("auto", False, "enter"),
+    ("enter", True, "enter"),
+    ("off", True, None),
+])
+def test_send_keepalive(mode, negotiated, expected):
+    writer = FakeWriter(negotiated)
+    enters = []
+    assert send_keepalive(writer, mode, lambda: enters.append("\r\n")) == expected
+    assert enters == (["\r\n"] if expected == "enter" else [])
+    assert writer.iac == ([IAC_NOP] if expected == "nop" else [])
+
+
+def test_nop_without_telnet_commands_sends_nothing():
+    enters = []
+    assert send_keepalive(object(), "nop", lambda: enters.append("\r\n")) is None
+    assert enters == []
+
+
+class SilentReader:
+    """A connection on which the board never says anything."""
+
+    async def read(self, size):
+        await asyncio.Event().wait()
+
+
+def idle_session(monkeypatch, mode, seconds=0.4):
+    """
+    Run both idle-time senders, the keep-alive task and the silence probe in
+    read_until_closed, on a session that receives nothing; return (lines
+    typed, telnet commands sent, whether the read gave up on the connection).
+    """
+    for module in ("boto3", "openai", "requests", "telnetlib3", "bs4"):
+        pytest.importorskip(module)
+    import bbsbot.core as core_module
+
+    monkeypatch.setattr(core_module, "DEFAULT_SILENCE_PROBE", 0.05)
+    monkeypatch.setattr(core_module, "PROBE_TIMEOUT", 0.05)
+    core = core_module.BotCore()
+    typed = []
+    monkeypatch.setattr(core, "send_raw", typed.append)
+    core.connected = True
+    core.writer = FakeWriter()
+    core.keepalive = {"mode": mode, "idle": 0.05}
+
+    async def run():
+        keep_alive = asyncio.ensure_future(core.keep_alive())
+        read = asyncio.ensure_future(core.read_until_closed(SilentReader()))
+        await asyncio.sleep(seconds)
+        dropped = read.done()
+        core.stop_event.set()
+        core.keep_alive_stop_event.set()
+        keep_alive.cancel()
+        await asyncio.wait_for(read, 1)
+        return dropped
+
+    dropped = asyncio.run(run())
+    return typed, core.writer.iac, dropped
+
+
+@pytest.mark.parametrize("mode", ["nop", "off"])
+def test_idle_session_never_types_enter(monkeypatch, mode):
+    # The invariant of bbsbot.keepalive, across the keep-alive task and the silence probe
+    typed, iac, dropped = idle_session(monkeypatch, mode)
+    assert not any("\r" in text or "\n" in text for text in typed)
+    assert not dropped  # No answer is expected to a NOP, or to nothing at all
+    if mode == "nop":
+        assert iac and set(iac) == {IAC_NOP}
+    else:
+        assert iac == []
+
+
+def test_enter_probe_drops_a_silent_connection(monkeypatch):
+    typed, iac, dropped = idle_session(monkeypatch, "enter")
+    assert "\r\n" in typed and dropped
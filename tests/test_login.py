@@ -0,0 +1,40 @@
+from bbsbot.classifier import PROMPTS
+from bbsbot.login import LoginFlow
+from bbsbot.matcher import MultiMatcher
+
+# The MajorBBS logon screen; it contains both username patterns
+LOGIN_PROMPT = 'If you already have a User-ID on this system, type it in and press ENTER.\r\nOtherwise type "new": '
+
+
+def make_flow(sent):
+    return LoginFlow(lambda: sent.append("user"), lambda: sent.append("pass"), lambda: sent.append("tele"))
+
+
+def replay(flow, *screens):
+    matcher = MultiMatcher(PROMPTS)
+    for screen in screens:
+        for name in matcher.feed(screen):
+            flow.on_prompt(name)
+
+
+def test_logon_screen_sends_username_once():
+    sent = []
+    replay(make_flow(sent), "Welcome!\r\n\r\n" + LOGIN_PROMPT, "\r\nEnter your password: ",
+           "\r\nGreetings, user, glad to see you back again.\r\n")
+    assert sent == ["user", "pass", "tele"]
+
+
+def test_username_sent_again_after_rejected_password():
+    sent = []
+    replay(make_flow(sent), LOGIN_PROMPT, "\r\nEnter your password: ",
+           "\r\nSorry, that is not the correct password.\r\n\r\n" + LOGIN_PROMPT)
+    assert sent == ["user", "pass", "user"]
+
+
+def test_nothing_answered_after_logon():
+    sent = []
+    flow = make_flow(sent)
+    replay(flow, LOGIN_PROMPT, "Enter your password: ", "Greetings, user, glad to see you back again.",
+           "From Bob: type it in and press enter: Enter your password: ")
+    assert sent == ["user", "pass", "tele"]
+    assert flow.state == LoginFlow.DONE
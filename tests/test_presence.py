@@ -0,0 +1,38 @@
+from bbsbot.presence import LastSeenStore, PresenceIndex, format_age, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name(" Night@thepenaltybox.org ") == "night"
+    assert normalize_name("https://example.com/x") is None
+
+
+def test_prefix_and_similar():
+    index = PresenceIndex()
+    for name, when in (("dracula", 300), ("drake", 200), ("draco", 100), ("night", 50), ("Night@bbs.org", 400)):
+        index.add(name, when)
+    assert index.get("NIGHT") == 400
+    assert index.prefix("dra", limit=2) == [("dracula", 300), ("drake", 200)]
+    assert index.similar("dracla")[0] == ("dracula", 300)
+    assert index.similar("nigth") == [("night", 400)]  # A swap is one edit
+    assert index.similar("xight") == []  # The first letter is taken as typed
+
+
+def test_format_age():
+    assert [format_age(s) for s in (5, 125, 3 * 3600 + 300, 2 * 86400 + 4 * 3600)] == ["5s ago", "2m ago", "3h 5m ago", "2d 4h ago"]
+
+
+def test_journal_survives_restart_and_torn_line(tmp_path):
+    path = str(tmp_path / "last_seen.json")
+    store = LastSeenStore(path)
+    store.touch(["Bob"], 1000)
+    store.flush()
+    with open(path + ".journal", "a") as file:
+        file.write('{"al": 20')  # Cut short by a crash
+    reloaded = LastSeenStore(path)
+    reloaded.load()
+    assert reloaded.get("bob") == 1000
+    reloaded.touch(["al"], 3000)
+    reloaded.flush()
+    again = LastSeenStore(path)
+    again.load()
+    assert again.get("al") == 3000 and again.get("bob") == 1000
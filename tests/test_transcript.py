@@ -0,0 +1,42 @@
+from bbsbot.transcript import TranscriptIndex, search_terms
+
+
+def make_index(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "transcript.db"), flush_interval=0.01)
+    index.open()
+    index.start()
+    for when, (kind, username, text) in enumerate([
+        ("public", "Bob@bbs.org", "I love pizza with pineapple"),
+        ("public", "Al", "pizza is overrated"),
+        ("whisper", "Bob", "my secret pizza code"),
+        ("public", "Bobby", "pizza time"),
+    ]):
+        index.add("room", kind, username, text, 1000 + when)
+    index.stop()  # Writes everything queued
+    index.open()
+    return index
+
+
+def test_search_terms():
+    assert search_terms('What did bill.the.cat say about "pizza"? wea*') == [
+        "what", "did", "bill.the.cat", "say", "about", "pizza", "wea*"
+    ]
+
+
+def test_newest_first_and_private_lines(tmp_path):
+    index = make_index(tmp_path)
+    assert [line.text for line in index.search("pizza")] == [
+        "pizza time", "my secret pizza code", "pizza is overrated", "I love pizza with pineapple"
+    ]
+    assert [line.username for line in index.search("pizza", viewer="")] == ["Bobby", "Al", "Bob@bbs.org"]
+    assert [line.kind for line in index.search("secret", viewer="bob")] == ["whisper"]
+    assert index.search("secret", viewer="al") == []
+    index.stop()
+
+
+def test_user_filter_and_prefix(tmp_path):
+    index = make_index(tmp_path)
+    assert [line.username for line in index.search("pizza", username="bob")] == ["Bob", "Bob@bbs.org"]
+    assert [line.text for line in index.search("pine*", room="room")] == ["I love pizza with pineapple"]
+    assert index.search("pizza", room="elsewhere") == []
+    index.stop()